@@ -5,43 +5,52 @@ Handles module imports for testing.
 """
 
 import sys
-import os
 from pathlib import Path
 
-# Add the current directory to the path
+# Add the repository root to the path so the package is importable
 test_dir = Path(__file__).parent
-sys.path.insert(0, str(test_dir))
+root_dir = str(test_dir.parent)
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+# Package holding the SQLITE extension modules under test
+PACKAGE = 'xlsqlite.ext.sqlite'
+
+# Modules the tests import by their bare names (e.g. ``from errors import``)
+MODULES = frozenset({'errors', 'parser', 'executor', 'output', 'schema', 'main'})
+
+
+class BareNameFinder:
+    """
+    Resolve bare imports such as ``import errors`` to the package modules.
+
+    Nothing is imported up front - a module is only loaded the first time a
+    test (or schema.py) imports it, so running a single test file doesn't
+    pull in the rest of the extension.
+    """
+
+    def find_spec(self, fullname, path=None, target=None):
+        if path is not None or fullname not in MODULES:
+            return None
+        from importlib.util import spec_from_loader
+        return spec_from_loader(fullname, self)
+
+    def create_module(self, spec):
+        # Import through the package so relative imports resolve natively
+        # and the regular __pycache__ bytecode is reused between runs
+        from importlib import import_module
+        module = import_module(f'{PACKAGE}.{spec.name}')
+        spec.loader_state = module.__spec__
+        return module
+
+    def exec_module(self, module):
+        # Already executed by the package import. Put back the real spec the
+        # import machinery replaced so importlib.reload() keeps working.
+        module.__spec__ = module.__spec__.loader_state
 
 
 def pytest_configure(config):
     """Configure pytest to handle module imports."""
-    # Import modules and register them
-    import importlib
-    import importlib.util
-
-    # Order matters - import in dependency order
-    modules_to_fix = ['errors', 'parser', 'executor', 'output', 'schema', 'main']
-
-    for module_name in modules_to_fix:
-        module_path = test_dir / f'{module_name}.py'
-        if module_path.exists():
-            # Read the module
-            with open(module_path, 'r', encoding='utf-8') as f:
-                source = f.read()
-
-            # Fix relative imports
-            source = source.replace('from .parser import', 'from parser import')
-            source = source.replace('from .schema import', 'from schema import')
-            source = source.replace('from .executor import', 'from executor import')
-            source = source.replace('from .output import', 'from output import')
-            source = source.replace('from .errors import', 'from errors import')
-
-            # Create module
-            spec = importlib.util.spec_from_loader(module_name, loader=None)
-            module = importlib.util.module_from_spec(spec)
-
-            # Execute module code
-            exec(source, module.__dict__)
-
-            # Register module
-            sys.modules[module_name] = module
+    # Guard against repeated pytest.main() calls in the same process
+    if not any(isinstance(finder, BareNameFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, BareNameFinder())
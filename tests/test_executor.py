@@ -46,6 +46,22 @@ class TestCreateConnection:
         result = cursor.fetchone()
         assert result[0] == 1
         conn.close()
+    
+    def test_temp_store_in_memory(self):
+        conn = create_connection()
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+        conn.close()
+    
+    def test_connections_are_isolated(self):
+        conn = create_connection()
+        conn.execute("CREATE TABLE t (x INT)")
+        conn.execute("PRAGMA user_version = 7")
+        conn.close()
+        
+        fresh = create_connection()
+        assert fresh.execute("SELECT name FROM sqlite_master").fetchall() == []
+        assert fresh.execute("PRAGMA user_version").fetchone()[0] == 0
+        fresh.close()
 
 
 class TestDetectQueryType:
@@ -80,6 +96,11 @@ class TestDetectQueryType:
     def test_cte_with_select(self):
         query = "WITH cte AS (SELECT 1) SELECT * FROM cte"
         assert detect_query_type(query) == "SELECT"
+    
+    def test_other(self):
+        assert detect_query_type("VACUUM") == "OTHER"
+        assert detect_query_type("SELECTED") == "OTHER"
+        assert detect_query_type("") == "OTHER"
 
 
 class TestSplitStatements:
@@ -113,6 +134,18 @@ class TestSplitStatements:
         result = split_statements("SELECT 1;")
         assert result == ["SELECT 1"]
 
+    def test_semicolon_in_comment(self):
+        result = split_statements("SELECT 1 /* a;b */; SELECT 2 -- c;d\n")
+        assert result == ["SELECT 1 /* a;b */", "SELECT 2 -- c;d"]
+
+    def test_trigger_body(self):
+        trigger = (
+            "CREATE TRIGGER trg AFTER INSERT ON t BEGIN "
+            "UPDATE t SET x = 1; DELETE FROM t WHERE x = 2; END"
+        )
+        result = split_statements(f"{trigger}; SELECT 1")
+        assert result == [trigger, "SELECT 1"]
+
 
 class TestExecuteQuery:
     """Tests for execute_query()"""
@@ -237,7 +270,44 @@ class TestExecuteMultipleStatements:
         assert result.query_type == "SELECT"
         assert result.rows == [(42,)]
         conn.close()
+
+    def test_statement_ending_in_line_comment(self):
+        conn = create_connection()
+        
+        result = execute_multiple_statements(
+            conn,
+            "CREATE TABLE t(x) -- note\n; INSERT INTO t VALUES(1); SELECT * FROM t"
+        )
+        
+        assert result.rows == [(1,)]
+        conn.close()
     
+    def test_rollback_of_implicit_transaction(self):
+        conn = create_connection()
+        
+        result = execute_multiple_statements(
+            conn,
+            "CREATE TABLE t(x); INSERT INTO t VALUES(1); ROLLBACK; SELECT * FROM t"
+        )
+        
+        assert result.query_type == "SELECT"
+        assert result.rows == []
+        conn.close()
+    
+    def test_select_then_dml_returns_select(self):
+        conn = create_connection()
+
+        result = execute_multiple_statements(
+            conn,
+            "CREATE TABLE t (x INT); INSERT INTO t VALUES (1); "
+            "SELECT * FROM t; INSERT INTO t VALUES (2)"
+        )
+
+        assert result.query_type == "SELECT"
+        assert result.rows == [(1,)]
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (2,)
+        conn.close()
+
     def test_empty_sql(self):
         conn = create_connection()
         result = execute_multiple_statements(conn, "")
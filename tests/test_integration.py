@@ -11,11 +11,14 @@ This module tests the complete workflow from SQL query to result:
 Since resolve_reference() doesn't have xl() yet, we use mock data.
 """
 
+import re
 import pytest
 import pandas as pd
 import numpy as np
 from unittest.mock import Mock
 from datetime import datetime
+from time import perf_counter_ns
+from typing import Optional
 
 # Import modules - conftest has already loaded them
 import main
@@ -39,6 +42,105 @@ from errors import (
 # Mock Data Fixtures
 # ============================================================================
 
+# Map of table names to mock data factories
+MOCK_TABLES = {
+    "Orders": lambda: pd.DataFrame({
+        'OrderID': [1, 2, 3, 4, 5],
+        'CustomerID': [101, 102, 101, 103, 102],
+        'Total': [150.50, 200.00, 75.25, 325.75, 99.99],
+        'Status': ['completed', 'pending', 'completed', 'completed', 'pending'],
+        'OrderDate': ['2024-01-15', '2024-01-16', '2024-01-17', '2024-01-18', '2024-01-19']
+    }),
+
+    "Customers": lambda: pd.DataFrame({
+        'CustomerID': [101, 102, 103],
+        'Name': ['Alice', 'Bob', 'Charlie'],
+        'City': ['New York', 'Los Angeles', 'Chicago'],
+        'Active': [True, True, False]
+    }),
+
+    "Products": lambda: pd.DataFrame({
+        'ProductID': [1001, 1002, 1003, 1004],
+        'ProductName': ['Widget', 'Gadget', 'Doohickey', 'Thingamajig'],
+        'Price': [19.99, 29.99, 39.99, 49.99],
+        'Category': ['Tools', 'Electronics', 'Tools', 'Electronics']
+    }),
+
+    "Sales": lambda: pd.DataFrame({
+        'SaleID': [1, 2, 3, 4, 5, 6],
+        'ProductID': [1001, 1002, 1001, 1003, 1002, 1004],
+        'Quantity': [5, 3, 2, 1, 7, 4],
+        'SaleDate': ['2024-01-10', '2024-01-11', '2024-01-12', '2024-01-13', '2024-01-14', '2024-01-15'],
+        'Revenue': [99.95, 89.97, 39.98, 39.99, 209.93, 199.96]
+    }),
+
+    "Employees": lambda: pd.DataFrame({
+        'EmployeeID': [1, 2, 3, 4],
+        'Name': ['John', 'Jane', 'Jim', 'Jill'],
+        'Department': ['Sales', 'Engineering', 'Sales', 'HR'],
+        'Salary': [50000, 75000, 55000, 60000],
+        'HireDate': ['2020-01-15', '2019-06-01', '2021-03-10', '2020-09-01']
+    }),
+
+    # Test data with mixed types
+    "MixedTypes": lambda: pd.DataFrame({
+        'ID': [1, 2, 3],
+        'IntCol': [10, 20, 30],
+        'FloatCol': [1.5, 2.5, 3.5],
+        'TextCol': ['apple', 'banana', 'cherry'],
+        'BoolCol': [True, False, True],
+        'DateCol': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03'])
+    }),
+
+    # Test data with nulls
+    "WithNulls": lambda: pd.DataFrame({
+        'ID': [1, 2, 3, 4],
+        'Value': [100, None, 300, None],
+        'Name': ['Alice', 'Bob', None, 'David']
+    }),
+
+    # Test data for duplicate column detection
+    "DuplicateCols": lambda: pd.DataFrame({
+        'ID': [1, 2],
+        'Name': ['Alice', 'Bob'],
+        'Name.1': ['Duplicate', 'Column']  # pandas adds .1 for duplicates
+    }),
+
+    # Test data with empty column name (simulated)
+    "EmptyCol": lambda: pd.DataFrame({
+        'ID': [1, 2],
+        '': ['value1', 'value2']  # Empty column name
+    }),
+}
+
+
+class LazyTables(dict):
+    """
+    Mock tables built on first lookup.
+
+    A test only pays for the tables its query references. The loaders only
+    read these frames (prepare_data_for_sqlite works on a copy), so once
+    built a frame is shared by every later lookup instead of copied.
+    """
+
+    def __missing__(self, name):
+        df = self[name] = MOCK_TABLES[name]()
+        return df
+
+
+MOCK_DATA = LazyTables()
+
+# Case-insensitive lookup of MOCK_TABLES names
+MOCK_INDEX = {name.lower(): name for name in MOCK_TABLES}
+
+# Row counts of the mock tables most tests query in full (literals, so
+# collection doesn't build the tables; keep in sync with MOCK_TABLES)
+ORDER_ROWS = 5
+CUSTOMER_ROWS = 3
+SALE_ROWS = 6
+EMPLOYEE_ROWS = 4
+
+
 def create_mock_resolve_reference():
     """
     Create mock resolve_reference function with predefined test data.
@@ -48,84 +150,11 @@ def create_mock_resolve_reference():
     def mock_resolve(ref: TableReference) -> pd.DataFrame:
         """Mock xl() function for testing."""
 
-        # Map of table names to mock data
-        mock_data = {
-            "Orders": pd.DataFrame({
-                'OrderID': [1, 2, 3, 4, 5],
-                'CustomerID': [101, 102, 101, 103, 102],
-                'Total': [150.50, 200.00, 75.25, 325.75, 99.99],
-                'Status': ['completed', 'pending', 'completed', 'completed', 'pending'],
-                'OrderDate': ['2024-01-15', '2024-01-16', '2024-01-17', '2024-01-18', '2024-01-19']
-            }),
-
-            "Customers": pd.DataFrame({
-                'CustomerID': [101, 102, 103],
-                'Name': ['Alice', 'Bob', 'Charlie'],
-                'City': ['New York', 'Los Angeles', 'Chicago'],
-                'Active': [True, True, False]
-            }),
-
-            "Products": pd.DataFrame({
-                'ProductID': [1001, 1002, 1003, 1004],
-                'ProductName': ['Widget', 'Gadget', 'Doohickey', 'Thingamajig'],
-                'Price': [19.99, 29.99, 39.99, 49.99],
-                'Category': ['Tools', 'Electronics', 'Tools', 'Electronics']
-            }),
-
-            "Sales": pd.DataFrame({
-                'SaleID': [1, 2, 3, 4, 5, 6],
-                'ProductID': [1001, 1002, 1001, 1003, 1002, 1004],
-                'Quantity': [5, 3, 2, 1, 7, 4],
-                'SaleDate': ['2024-01-10', '2024-01-11', '2024-01-12', '2024-01-13', '2024-01-14', '2024-01-15'],
-                'Revenue': [99.95, 89.97, 39.98, 39.99, 209.93, 199.96]
-            }),
-
-            "Employees": pd.DataFrame({
-                'EmployeeID': [1, 2, 3, 4],
-                'Name': ['John', 'Jane', 'Jim', 'Jill'],
-                'Department': ['Sales', 'Engineering', 'Sales', 'HR'],
-                'Salary': [50000, 75000, 55000, 60000],
-                'HireDate': ['2020-01-15', '2019-06-01', '2021-03-10', '2020-09-01']
-            }),
-
-            # Test data with mixed types
-            "MixedTypes": pd.DataFrame({
-                'ID': [1, 2, 3],
-                'IntCol': [10, 20, 30],
-                'FloatCol': [1.5, 2.5, 3.5],
-                'TextCol': ['apple', 'banana', 'cherry'],
-                'BoolCol': [True, False, True],
-                'DateCol': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03'])
-            }),
-
-            # Test data with nulls
-            "WithNulls": pd.DataFrame({
-                'ID': [1, 2, 3, 4],
-                'Value': [100, None, 300, None],
-                'Name': ['Alice', 'Bob', None, 'David']
-            }),
-
-            # Test data for duplicate column detection
-            "DuplicateCols": pd.DataFrame({
-                'ID': [1, 2],
-                'Name': ['Alice', 'Bob'],
-                'Name.1': ['Duplicate', 'Column']  # pandas adds .1 for duplicates
-            }),
-
-            # Test data with empty column name (simulated)
-            "EmptyCol": pd.DataFrame({
-                'ID': [1, 2],
-                '': ['value1', 'value2']  # Empty column name
-            }),
-        }
-
         # Check which table is being referenced
         # Try matching by original name, table_name, or sqlite_name
-        for key, df in mock_data.items():
-            if (ref.original.lower() == key.lower() or
-                (ref.table_name and ref.table_name.lower() == key.lower()) or
-                ref.sqlite_name.lower() == key.lower()):
-                return df.copy()
+        for name in (ref.original, ref.table_name, ref.sqlite_name):
+            if name and name.lower() in MOCK_INDEX:
+                return MOCK_DATA[MOCK_INDEX[name.lower()]]
 
         # If no match, raise error
         from errors import RangeResolutionError
@@ -134,17 +163,21 @@ def create_mock_resolve_reference():
     return mock_resolve
 
 
-@pytest.fixture
-def mock_xl_data(monkeypatch):
+@pytest.fixture(scope="module")
+def mock_xl_data():
     """
     Fixture to mock resolve_reference for all tests.
 
     Replaces the resolve_reference function with mock implementation.
+    The mock is read-only, so it is installed once for the whole module
+    and removed again when the module's tests are done.
     """
     mock_fn = create_mock_resolve_reference()
-    # Monkeypatch in both schema module and main module (main imports it directly)
-    monkeypatch.setattr(schema, 'resolve_reference', mock_fn)
-    monkeypatch.setattr(main, 'resolve_reference', mock_fn)
+    with pytest.MonkeyPatch.context() as mp:
+        # Monkeypatch in both schema module and main module (main imports it directly)
+        mp.setattr(schema, 'resolve_reference', mock_fn)
+        mp.setattr(main, 'resolve_reference', mock_fn)
+        yield
 
 
 # ============================================================================
@@ -169,6 +202,28 @@ def assert_dataframe_equal(df1: pd.DataFrame, df2: pd.DataFrame):
     pd.testing.assert_frame_equal(df1, df2, check_dtype=False)
 
 
+def assert_df(result, rows: Optional[int] = None, cols: Optional[list[str]] = None):
+    """Assert result is a DataFrame, optionally with a row count and columns."""
+    assert isinstance(result, pd.DataFrame), f"Expected DataFrame, got {type(result).__name__}: {result!r}"
+    if rows is not None:
+        assert len(result) == rows, f"Row count differs: {len(result)} vs {rows}"
+    if cols is not None:
+        missing = [col for col in cols if col not in result.columns]
+        assert not missing, f"Missing columns: {missing}"
+
+
+def assert_sorted_equal(values, expected):
+    """Assert a column holds the expected values in any order."""
+    actual = np.sort(np.asarray(values))
+    assert np.array_equal(actual, np.asarray(expected)), f"{actual} != {expected}"
+
+
+def is_sorted(values, descending: bool = False) -> bool:
+    """Check that a column's values are in order with one numpy diff."""
+    steps = np.diff(np.asarray(values))
+    return bool((steps <= 0).all() if descending else (steps >= 0).all())
+
+
 # ============================================================================
 # Basic Query Tests
 # ============================================================================
@@ -180,35 +235,29 @@ class TestBasicQueries:
         """Test: SELECT * FROM single table."""
         result = run_sqlite_query("SELECT * FROM Orders")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 5
-        assert 'OrderID' in result.columns
-        assert 'CustomerID' in result.columns
-        assert 'Total' in result.columns
+        assert_df(result, rows=ORDER_ROWS, cols=['OrderID', 'CustomerID', 'Total'])
 
     def test_select_specific_columns(self, mock_xl_data):
         """Test: SELECT specific columns."""
         result = run_sqlite_query("SELECT OrderID, Total FROM Orders")
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         assert list(result.columns) == ['OrderID', 'Total']
-        assert len(result) == 5
+        assert len(result) == ORDER_ROWS
 
     def test_select_with_alias(self, mock_xl_data):
         """Test: SELECT with column aliases."""
         result = run_sqlite_query("SELECT OrderID AS id, Total AS amount FROM Orders")
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         assert list(result.columns) == ['id', 'amount']
-        assert len(result) == 5
+        assert len(result) == ORDER_ROWS
 
     def test_select_distinct(self, mock_xl_data):
         """Test: SELECT DISTINCT."""
         result = run_sqlite_query("SELECT DISTINCT CustomerID FROM Orders")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3  # 3 unique customers
-        assert 'CustomerID' in result.columns
+        assert_df(result, rows=3, cols=['CustomerID'])  # 3 unique customers
 
 
 class TestWhereClause:
@@ -218,25 +267,22 @@ class TestWhereClause:
         """Test: WHERE with numeric comparison."""
         result = run_sqlite_query("SELECT * FROM Orders WHERE Total > 100")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3  # 3 orders with Total > 100
-        assert all(result['Total'] > 100)
+        assert_df(result, rows=3)  # 3 orders with Total > 100
+        assert (result['Total'].to_numpy() > 100).all()
 
     def test_where_string_equality(self, mock_xl_data):
         """Test: WHERE with string equality."""
         result = run_sqlite_query("SELECT * FROM Orders WHERE Status = 'completed'")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3  # 3 completed orders
-        assert all(result['Status'] == 'completed')
+        assert_df(result, rows=3)  # 3 completed orders
+        assert (result['Status'].to_numpy() == 'completed').all()
 
     def test_where_in_clause(self, mock_xl_data):
         """Test: WHERE with IN clause."""
         result = run_sqlite_query("SELECT * FROM Orders WHERE CustomerID IN (101, 103)")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3
-        assert all(result['CustomerID'].isin([101, 103]))
+        assert_df(result, rows=3)
+        assert result['CustomerID'].isin([101, 103]).all()
 
     def test_where_and_or(self, mock_xl_data):
         """Test: WHERE with AND/OR."""
@@ -244,25 +290,23 @@ class TestWhereClause:
             "SELECT * FROM Orders WHERE Total > 100 AND Status = 'completed'"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 2
-        assert all((result['Total'] > 100) & (result['Status'] == 'completed'))
+        assert_df(result, rows=2)
+        assert ((result['Total'] > 100) & (result['Status'] == 'completed')).all()
 
     def test_where_between(self, mock_xl_data):
         """Test: WHERE with BETWEEN."""
         result = run_sqlite_query("SELECT * FROM Orders WHERE Total BETWEEN 75 AND 200")
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         # BETWEEN is inclusive on both ends: 75.25, 99.99, 150.50, 200.00
         assert len(result) == 4
-        assert all((result['Total'] >= 75) & (result['Total'] <= 200))
+        assert ((result['Total'] >= 75) & (result['Total'] <= 200)).all()
 
     def test_where_like(self, mock_xl_data):
         """Test: WHERE with LIKE."""
         result = run_sqlite_query("SELECT * FROM Customers WHERE Name LIKE 'A%'")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 1
+        assert_df(result, rows=1)
         assert result.iloc[0]['Name'] == 'Alice'
 
 
@@ -281,11 +325,7 @@ class TestJoins:
             "JOIN Customers c ON o.CustomerID = c.CustomerID"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 5  # All orders have matching customers
-        assert 'OrderID' in result.columns
-        assert 'Name' in result.columns
-        assert 'Total' in result.columns
+        assert_df(result, rows=ORDER_ROWS, cols=['OrderID', 'Name', 'Total'])  # All orders have matching customers
 
     def test_left_join(self, mock_xl_data):
         """Test: LEFT JOIN."""
@@ -296,7 +336,7 @@ class TestJoins:
             "ORDER BY c.Name"
         )
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         assert len(result) >= 3  # At least one row per customer
 
     def test_join_three_tables(self, mock_xl_data):
@@ -308,10 +348,7 @@ class TestJoins:
             "ORDER BY s.SaleID"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 6  # 6 sales records
-        assert 'SaleID' in result.columns
-        assert 'ProductName' in result.columns
+        assert_df(result, rows=SALE_ROWS, cols=['SaleID', 'ProductName'])
 
     def test_self_join(self, mock_xl_data):
         """Test: Self join."""
@@ -322,7 +359,7 @@ class TestJoins:
             "WHERE e1.EmployeeID < e2.EmployeeID"
         )
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         # Should find pairs of employees in same department
 
 
@@ -337,15 +374,14 @@ class TestAggregation:
         """Test: COUNT aggregation."""
         result = run_sqlite_query("SELECT COUNT(*) AS total FROM Orders")
 
-        assert isinstance(result, pd.DataFrame)
-        assert result.iloc[0]['total'] == 5
+        assert_df(result)
+        assert result.iloc[0]['total'] == ORDER_ROWS
 
     def test_sum(self, mock_xl_data):
         """Test: SUM aggregation."""
         result = run_sqlite_query("SELECT SUM(Total) AS total_revenue FROM Orders")
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'total_revenue' in result.columns
+        assert_df(result, cols=['total_revenue'])
         assert result.iloc[0]['total_revenue'] > 0
 
     def test_avg_min_max(self, mock_xl_data):
@@ -355,10 +391,7 @@ class TestAggregation:
             "FROM Orders"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'avg_total' in result.columns
-        assert 'min_total' in result.columns
-        assert 'max_total' in result.columns
+        assert_df(result, cols=['avg_total', 'min_total', 'max_total'])
         assert result.iloc[0]['min_total'] == 75.25
         assert result.iloc[0]['max_total'] == 325.75
 
@@ -371,10 +404,7 @@ class TestAggregation:
             "ORDER BY CustomerID"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3  # 3 unique customers
-        assert 'CustomerID' in result.columns
-        assert 'total_spent' in result.columns
+        assert_df(result, rows=3, cols=['CustomerID', 'total_spent'])  # 3 unique customers
 
     def test_group_by_having(self, mock_xl_data):
         """Test: GROUP BY with HAVING."""
@@ -385,9 +415,9 @@ class TestAggregation:
             "HAVING SUM(Total) > 200"
         )
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         assert len(result) >= 1  # At least one customer with > 200 total
-        assert all(result['total_spent'] > 200)
+        assert (result['total_spent'].to_numpy() > 200).all()
 
     def test_group_by_multiple_columns(self, mock_xl_data):
         """Test: GROUP BY multiple columns."""
@@ -397,8 +427,7 @@ class TestAggregation:
             "GROUP BY Status"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 2  # 2 status types
+        assert_df(result, rows=2)  # 2 status types
 
 
 # ============================================================================
@@ -412,8 +441,7 @@ class TestOrderingAndLimiting:
         """Test: ORDER BY ascending."""
         result = run_sqlite_query("SELECT * FROM Orders ORDER BY Total ASC")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 5
+        assert_df(result, rows=ORDER_ROWS)
         # Check first row has lowest total
         assert result.iloc[0]['Total'] == 75.25
 
@@ -421,8 +449,7 @@ class TestOrderingAndLimiting:
         """Test: ORDER BY descending."""
         result = run_sqlite_query("SELECT * FROM Orders ORDER BY Total DESC")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 5
+        assert_df(result, rows=ORDER_ROWS)
         # Check first row has highest total
         assert result.iloc[0]['Total'] == 325.75
 
@@ -432,22 +459,19 @@ class TestOrderingAndLimiting:
             "SELECT * FROM Orders ORDER BY CustomerID, Total DESC"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 5
+        assert_df(result, rows=ORDER_ROWS)
 
     def test_limit(self, mock_xl_data):
         """Test: LIMIT clause."""
         result = run_sqlite_query("SELECT * FROM Orders LIMIT 3")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3
+        assert_df(result, rows=3)
 
     def test_limit_offset(self, mock_xl_data):
         """Test: LIMIT with OFFSET."""
         result = run_sqlite_query("SELECT * FROM Orders LIMIT 2 OFFSET 2")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 2
+        assert_df(result, rows=2)
 
 
 # ============================================================================
@@ -465,11 +489,10 @@ class TestWindowFunctions:
             "FROM Orders"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'rank' in result.columns
-        assert len(result) == 5
-        # Verify ranks are 1-5
-        assert sorted(result['rank'].tolist()) == [1, 2, 3, 4, 5]
+        assert_df(result, cols=['rank'])
+        assert len(result) == ORDER_ROWS
+        # Verify ranks are 1..N
+        assert_sorted_equal(result['rank'], range(1, ORDER_ROWS + 1))
 
     def test_rank(self, mock_xl_data):
         """Test: RANK() window function."""
@@ -479,8 +502,7 @@ class TestWindowFunctions:
             "FROM Sales"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'rank' in result.columns
+        assert_df(result, cols=['rank'])
 
     def test_partition_by(self, mock_xl_data):
         """Test: Window function with PARTITION BY."""
@@ -490,9 +512,8 @@ class TestWindowFunctions:
             "FROM Employees"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'dept_rank' in result.columns
-        assert len(result) == 4
+        assert_df(result, cols=['dept_rank'])
+        assert len(result) == EMPLOYEE_ROWS
 
     def test_running_total(self, mock_xl_data):
         """Test: Running total with window function."""
@@ -502,10 +523,9 @@ class TestWindowFunctions:
             "FROM Orders"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'running_total' in result.columns
+        assert_df(result, cols=['running_total'])
         # Running total should be increasing
-        assert result['running_total'].is_monotonic_increasing
+        assert is_sorted(result['running_total'])
 
 
 # ============================================================================
@@ -515,11 +535,9 @@ class TestWindowFunctions:
 class TestCTE:
     """Test Common Table Expressions (WITH clauses)."""
 
-    @pytest.mark.skip(reason="Parser currently extracts CTE names as table references - needs parser enhancement")
     def test_simple_cte(self, mock_xl_data):
         """Test: Simple CTE."""
         # CTEs work within a single query - no separate table resolution needed
-        # NOTE: Parser needs to be enhanced to recognize WITH clauses and ignore CTE names
         result = run_sqlite_query(
             "WITH big_orders AS ("
             "  SELECT * FROM Orders WHERE Total > 100"
@@ -527,11 +545,9 @@ class TestCTE:
             "SELECT * FROM big_orders"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3
-        assert all(result['Total'] > 100)
+        assert_df(result, rows=3)
+        assert (result['Total'].to_numpy() > 100).all()
 
-    @pytest.mark.skip(reason="Parser currently extracts CTE names as table references - needs parser enhancement")
     def test_multiple_ctes(self, mock_xl_data):
         """Test: Multiple CTEs."""
         result = run_sqlite_query(
@@ -543,11 +559,8 @@ class TestCTE:
             "JOIN active_customers c ON o.CustomerID = c.CustomerID"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'OrderID' in result.columns
-        assert 'Name' in result.columns
+        assert_df(result, cols=['OrderID', 'Name'])
 
-    @pytest.mark.skip(reason="Recursive CTE doesn't need external data but parser tries to extract table names")
     def test_recursive_cte(self, mock_xl_data):
         """Test: Recursive CTE - doesn't need external data."""
         result = run_sqlite_query(
@@ -559,9 +572,8 @@ class TestCTE:
             "SELECT x FROM cnt"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 5
-        assert sorted(result['x'].tolist()) == [1, 2, 3, 4, 5]
+        assert_df(result, rows=5)
+        assert_sorted_equal(result['x'], [1, 2, 3, 4, 5])
 
 
 # ============================================================================
@@ -578,9 +590,8 @@ class TestParameterizedQueries:
             101
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 2  # 2 orders for customer 101
-        assert all(result['CustomerID'] == 101)
+        assert_df(result, rows=2)  # 2 orders for customer 101
+        assert (result['CustomerID'].to_numpy() == 101).all()
 
     def test_multiple_parameters(self, mock_xl_data):
         """Test: Query with multiple parameters."""
@@ -589,10 +600,9 @@ class TestParameterizedQueries:
             101, 100
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 1
-        assert all(result['CustomerID'] == 101)
-        assert all(result['Total'] > 100)
+        assert_df(result, rows=1)
+        assert (result['CustomerID'].to_numpy() == 101).all()
+        assert (result['Total'].to_numpy() > 100).all()
 
     @pytest.mark.skip(reason="Multiple statements with parameters not supported yet")
     def test_parameter_in_values(self, mock_xl_data):
@@ -605,8 +615,7 @@ class TestParameterizedQueries:
             42
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 1
+        assert_df(result, rows=1)
         assert result.iloc[0]['id'] == 42
 
 
@@ -626,9 +635,8 @@ class TestMultipleStatements:
             "SELECT * FROM active"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3
-        assert all(result['Status'] == 'completed')
+        assert_df(result, rows=3)
+        assert (result['Status'].to_numpy() == 'completed').all()
 
     @pytest.mark.skip(reason="Parser extracts temp table names as Excel references - needs parser enhancement")
     def test_insert_and_select(self, mock_xl_data):
@@ -639,9 +647,8 @@ class TestMultipleStatements:
             "SELECT * FROM nums"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 3
-        assert sorted(result['n'].tolist()) == [1, 2, 3]
+        assert_df(result, rows=3)
+        assert_sorted_equal(result['n'], [1, 2, 3])
 
     @pytest.mark.skip(reason="Parser extracts temp table names as Excel references - needs parser enhancement")
     def test_update_and_select(self, mock_xl_data):
@@ -652,69 +659,70 @@ class TestMultipleStatements:
             "SELECT * FROM temp_orders WHERE CustomerID = 101"
         )
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         # Verify totals were increased by 10%
-        assert all(result['CustomerID'] == 101)
+        assert (result['CustomerID'].to_numpy() == 101).all()
 
 
 # ============================================================================
 # Type Inference and Preservation Tests
 # ============================================================================
 
-class TestTypeInference:
-    """Test type inference and preservation."""
+@pytest.fixture(scope="class")
+def mixed_types(mock_xl_data):
+    """Round-trip MixedTypes once for all of TestTypeInference's type checks."""
+    result = run_sqlite_query("SELECT * FROM MixedTypes")
+    assert_df(result)
+    return result
 
-    def test_integer_type_preserved(self, mock_xl_data):
-        """Test: Integer types are preserved."""
-        result = run_sqlite_query("SELECT ID, IntCol FROM MixedTypes")
 
-        assert isinstance(result, pd.DataFrame)
-        # Check that integer columns are returned as integers
-        assert pd.api.types.is_integer_dtype(result['ID']) or result['ID'].dtype == 'Int64'
-        assert pd.api.types.is_integer_dtype(result['IntCol']) or result['IntCol'].dtype == 'Int64'
-
-    def test_float_type_preserved(self, mock_xl_data):
-        """Test: Float types are preserved."""
-        result = run_sqlite_query("SELECT FloatCol FROM MixedTypes")
-
-        assert isinstance(result, pd.DataFrame)
-        assert pd.api.types.is_float_dtype(result['FloatCol'])
-
-    def test_text_type_preserved(self, mock_xl_data):
-        """Test: Text types are preserved."""
-        result = run_sqlite_query("SELECT TextCol FROM MixedTypes")
+class TestTypeInference:
+    """Test type inference and preservation."""
 
-        assert isinstance(result, pd.DataFrame)
+    @pytest.mark.parametrize("column, check", [
+        # Integer types are preserved
+        pytest.param('ID', pd.api.types.is_integer_dtype, id='integer-id'),
+        pytest.param('IntCol', pd.api.types.is_integer_dtype, id='integer'),
+        # Float types are preserved
+        pytest.param('FloatCol', pd.api.types.is_float_dtype, id='float'),
         # Text should be object or string dtype
-        assert result['TextCol'].dtype in ['object', 'string']
-
-    def test_boolean_to_integer(self, mock_xl_data):
-        """Test: Boolean values converted to 0/1."""
-        result = run_sqlite_query("SELECT BoolCol FROM MixedTypes")
-
-        assert isinstance(result, pd.DataFrame)
-        # SQLite stores bools as integers
-        unique_values = set(result['BoolCol'].dropna().unique())
-        assert unique_values.issubset({0, 1, True, False})
-
-    def test_datetime_to_text(self, mock_xl_data):
-        """Test: Datetime converted to ISO 8601 text."""
-        result = run_sqlite_query("SELECT DateCol FROM MixedTypes")
-
-        assert isinstance(result, pd.DataFrame)
+        pytest.param('TextCol', lambda col: col.dtype in ['object', 'string'], id='text'),
+        # SQLite stores bools as integers (0/1)
+        pytest.param('BoolCol', lambda col: col.dropna().isin([0, 1]).all(), id='boolean'),
         # Dates should be stored as text in ISO format
-        assert result['DateCol'].dtype in ['object', 'string']
+        pytest.param('DateCol', lambda col: col.dtype in ['object', 'string'], id='datetime'),
+    ])
+    def test_type_preserved(self, mixed_types, column, check):
+        """Test: Each MixedTypes column comes back with the expected type."""
+        assert check(mixed_types[column])
 
     def test_null_handling(self, mock_xl_data):
         """Test: NULL values handled correctly."""
         result = run_sqlite_query("SELECT * FROM WithNulls")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 4
+        assert_df(result, rows=4)
         # Check that NULLs are present
         assert result['Value'].isna().sum() == 2
         assert result['Name'].isna().sum() == 1
 
+    def test_large_integral_floats(self):
+        """Test: Integral floats beyond the int64 range don't wrap around."""
+        result = run_sqlite_query("SELECT 1e20 AS Big, -1e19 AS Small")
+
+        assert_df(result, rows=1)
+        assert result['Big'].iloc[0] == 1e20
+        assert result['Small'].iloc[0] == -1e19
+
+    def test_large_integers_with_nulls_exact(self):
+        """Test: Integers beyond float64 precision survive a column with NULLs."""
+        big = 2**62 + 1
+        result = run_sqlite_query(f"SELECT {big} AS Big UNION ALL SELECT NULL")
+
+        assert_df(result, rows=2)
+        assert result['Big'].dtype == 'Int64'
+        assert result['Big'].iloc[0] == big
+        assert pd.isna(result['Big'].iloc[1])
+
 
 # ============================================================================
 # Error Handling Tests
@@ -725,47 +733,33 @@ class TestErrorHandling:
 
     def test_table_not_found(self, mock_xl_data):
         """Test: Error when table doesn't exist."""
-        with pytest.raises(Exception) as exc_info:
-            run_sqlite_query("SELECT * FROM NonExistent")
-
         # Should raise some kind of error about table not found
-        error_msg = str(exc_info.value).lower()
-        assert 'table' in error_msg or 'range' in error_msg
+        with pytest.raises(Exception, match=r'(?i)table|range'):
+            run_sqlite_query("SELECT * FROM NonExistent")
 
     def test_syntax_error(self, mock_xl_data):
         """Test: SQL syntax error."""
-        with pytest.raises(Exception) as exc_info:
+        with pytest.raises(Exception, match=r'(?i)syntax|error'):
             run_sqlite_query("SELEC * FROM Orders")  # Typo in SELECT
 
-        error_msg = str(exc_info.value).lower()
-        assert 'syntax' in error_msg or 'error' in error_msg
-
     def test_empty_query(self, mock_xl_data):
         """Test: Empty query string."""
-        with pytest.raises(QuerySyntaxError) as exc_info:
+        with pytest.raises(QuerySyntaxError, match=r'(?i)empty'):
             run_sqlite_query("")
 
-        assert 'empty' in str(exc_info.value).lower()
-
     def test_parameter_count_mismatch(self, mock_xl_data):
         """Test: Parameter count doesn't match placeholders."""
         # Query has 1 placeholder but no parameters provided
         # This will fail during SQLite execution with a binding error
-        with pytest.raises((QuerySyntaxError, Exception)) as exc_info:
-            run_sqlite_query("SELECT * FROM Orders WHERE CustomerID = ?")
-
         # Should mention parameters or bindings
-        error_msg = str(exc_info.value).lower()
-        assert 'parameter' in error_msg or 'binding' in error_msg
+        with pytest.raises((QuerySyntaxError, Exception), match=r'(?i)parameter|binding'):
+            run_sqlite_query("SELECT * FROM Orders WHERE CustomerID = ?")
 
     def test_column_not_found(self, mock_xl_data):
         """Test: Column doesn't exist."""
-        with pytest.raises(Exception) as exc_info:
+        with pytest.raises(Exception, match=r'(?i)column|error'):
             run_sqlite_query("SELECT NonExistentColumn FROM Orders")
 
-        error_msg = str(exc_info.value).lower()
-        assert 'column' in error_msg or 'error' in error_msg
-
     def test_duplicate_column_names(self, mock_xl_data):
         """Test: Duplicate column names in source data."""
         # This should raise DuplicateColumnError during schema validation
@@ -773,15 +767,13 @@ class TestErrorHandling:
         # In real scenario with actual duplicates, would raise error
         # For now, test that query works with the renamed columns
         result = run_sqlite_query("SELECT * FROM DuplicateCols")
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
 
     def test_empty_column_name(self, mock_xl_data):
         """Test: Empty column name in source data."""
-        with pytest.raises(EmptyColumnNameError) as exc_info:
+        with pytest.raises(EmptyColumnNameError, match=r'(?i)empty'):
             run_sqlite_query("SELECT * FROM EmptyCol")
 
-        assert 'empty' in str(exc_info.value).lower()
-
 
 # ============================================================================
 # Complex Query Tests
@@ -808,13 +800,9 @@ class TestComplexQueries:
             "ORDER BY total_spent DESC"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'customer_name' in result.columns
-        assert 'order_count' in result.columns
-        assert 'total_spent' in result.columns
-        assert 'avg_order' in result.columns
+        assert_df(result, cols=['customer_name', 'order_count', 'total_spent', 'avg_order'])
         # Verify HAVING clause worked
-        assert all(result['total_spent'] > 150)
+        assert (result['total_spent'].to_numpy() > 150).all()
 
     def test_subquery(self, mock_xl_data):
         """Test: Subquery in WHERE clause."""
@@ -823,7 +811,7 @@ class TestComplexQueries:
             "WHERE Total > (SELECT AVG(Total) FROM Orders)"
         )
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         # Should return orders above average
         assert len(result) > 0
 
@@ -837,7 +825,7 @@ class TestComplexQueries:
             ")"
         )
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         # Should return customers with orders > 200
         assert len(result) >= 1
 
@@ -855,9 +843,10 @@ class TestComplexQueries:
             "FROM Orders"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'order_size' in result.columns
-        assert set(result['order_size'].unique()).issubset({'Small', 'Medium', 'Large'})
+        assert_df(result, cols=['order_size'])
+        # Values outside the declared categories become NaN
+        sizes = pd.Categorical(result['order_size'], categories=['Small', 'Medium', 'Large'])
+        assert not sizes.isna().any()
 
     def test_union(self, mock_xl_data):
         """Test: UNION of two queries."""
@@ -868,10 +857,8 @@ class TestComplexQueries:
             "ORDER BY Name"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'type' in result.columns
-        assert 'Name' in result.columns
-        assert len(result) == 7  # 3 customers + 4 employees
+        assert_df(result, cols=['type', 'Name'])
+        assert len(result) == CUSTOMER_ROWS + EMPLOYEE_ROWS
 
     def test_cross_join(self, mock_xl_data):
         """Test: CROSS JOIN (Cartesian product)."""
@@ -882,9 +869,7 @@ class TestComplexQueries:
             "LIMIT 5"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'cust' in result.columns
-        assert 'emp' in result.columns
+        assert_df(result, cols=['cust', 'emp'])
 
 
 # ============================================================================
@@ -898,22 +883,19 @@ class TestEdgeCases:
         """Test: Query returns no rows."""
         result = run_sqlite_query("SELECT * FROM Orders WHERE Total > 10000")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 0
+        assert_df(result, rows=0)
 
     def test_single_row_result(self, mock_xl_data):
         """Test: Query returns exactly one row."""
         result = run_sqlite_query("SELECT COUNT(*) AS cnt FROM Orders")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 1
-        assert 'cnt' in result.columns
+        assert_df(result, rows=1, cols=['cnt'])
 
     def test_single_column_result(self, mock_xl_data):
         """Test: Query returns single column."""
         result = run_sqlite_query("SELECT OrderID FROM Orders")
 
-        assert isinstance(result, pd.DataFrame)
+        assert_df(result)
         assert len(result.columns) == 1
         assert result.columns[0] == 'OrderID'
 
@@ -923,9 +905,8 @@ class TestEdgeCases:
             "SELECT COUNT(*) AS cnt, SUM(Total) AS sum, AVG(Total) AS avg FROM Orders"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 1
-        assert result.iloc[0]['cnt'] == 5
+        assert_df(result, rows=1)
+        assert result.iloc[0]['cnt'] == ORDER_ROWS
 
     def test_order_by_computed_column(self, mock_xl_data):
         """Test: ORDER BY computed column."""
@@ -935,17 +916,25 @@ class TestEdgeCases:
             "ORDER BY with_tax DESC"
         )
 
-        assert isinstance(result, pd.DataFrame)
-        assert 'with_tax' in result.columns
+        assert_df(result, cols=['with_tax'])
         # Verify ordering
-        assert list(result['with_tax']) == sorted(result['with_tax'], reverse=True)
+        assert is_sorted(result['with_tax'], descending=True)
 
     def test_limit_larger_than_result(self, mock_xl_data):
         """Test: LIMIT larger than result set."""
         result = run_sqlite_query("SELECT * FROM Orders LIMIT 1000")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 5  # Only 5 rows exist
+        assert_df(result, rows=ORDER_ROWS)  # Only ORDER_ROWS rows exist
+
+    @pytest.mark.parametrize("query", [
+        "SELECT * FROM /* comment */ Orders",
+        "SELECT * FROM -- comment\n Orders",
+    ], ids=['block-comment', 'line-comment'])
+    def test_comment_before_table(self, mock_xl_data, query):
+        """Test: A comment between FROM and the table name."""
+        result = run_sqlite_query(query)
+
+        assert_df(result, rows=ORDER_ROWS)
 
 
 # ============================================================================
@@ -959,8 +948,7 @@ class TestSQLITEFunction:
         """Test: SQLITE() returns DataFrame on success."""
         result = main.SQLITE("SELECT * FROM Orders")
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 5
+        assert_df(result, rows=ORDER_ROWS)
 
     def test_sqlite_returns_error_string_on_failure(self, mock_xl_data):
         """Test: SQLITE() returns error string on failure."""
@@ -968,21 +956,20 @@ class TestSQLITEFunction:
 
         # Should return error string, not raise exception
         assert isinstance(result, str)
-        assert 'error' in result.lower() or 'table' in result.lower()
+        assert re.search(r'(?i)error|table', result)
 
     def test_sqlite_with_parameters(self, mock_xl_data):
         """Test: SQLITE() with parameters."""
         result = main.SQLITE("SELECT * FROM Orders WHERE CustomerID = ?", 101)
 
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 2
+        assert_df(result, rows=2)
 
     def test_sqlite_syntax_error_returns_string(self, mock_xl_data):
         """Test: SQLITE() returns error string for syntax error."""
         result = main.SQLITE("SELEC * FROM Orders")
 
         assert isinstance(result, str)
-        assert 'error' in result.lower()
+        assert re.search(r'(?i)error', result)
 
 
 # ============================================================================
@@ -992,20 +979,24 @@ class TestSQLITEFunction:
 class TestPerformanceAndLimits:
     """Test performance characteristics and limit handling."""
 
-    def test_large_result_warning(self, mock_xl_data, monkeypatch):
-        """Test: Warning for large result sets."""
+    @pytest.fixture
+    def large_xl_data(self, mock_xl_data, monkeypatch):
+        """Add a 150,000 row LargeTable to the mock data."""
         # Create mock with many rows
         def large_mock_resolve(ref):
             if 'large' in ref.original.lower():
-                # Create DataFrame with many rows
-                return pd.DataFrame({
-                    'ID': range(150000),
-                    'Value': range(150000)
-                })
+                # Create DataFrame with many rows - both columns view one
+                # int32 buffer instead of two int64 arrays built from range()
+                values = np.arange(150_000, dtype=np.int32)
+                return pd.DataFrame({'ID': values, 'Value': values}, copy=False)
             return create_mock_resolve_reference()(ref)
 
+        # main imports resolve_reference directly, so patch it there too
         monkeypatch.setattr(schema, 'resolve_reference', large_mock_resolve)
+        monkeypatch.setattr(main, 'resolve_reference', large_mock_resolve)
 
+    def test_large_result_warning(self, large_xl_data):
+        """Test: Warning for large result sets."""
         # This should trigger a warning but still work
         result = main.SQLITE("SELECT * FROM LargeTable")
 
@@ -1013,22 +1004,26 @@ class TestPerformanceAndLimits:
         # depending on limit enforcement
         assert isinstance(result, (pd.DataFrame, str))
 
+    def test_order_by_limit_on_large_table(self, large_xl_data):
+        """Test: ORDER BY ... LIMIT keeps only the top rows of a large table."""
+        result = run_sqlite_query("SELECT * FROM LargeTable ORDER BY Value DESC LIMIT 10")
+
+        assert_df(result, rows=10)
+        assert np.array_equal(result['Value'].to_numpy(), np.arange(149_999, 149_989, -1))
+
     def test_execution_completes_reasonably(self, mock_xl_data):
         """Test: Query execution completes in reasonable time."""
-        import time
-
-        start = time.time()
+        start = perf_counter_ns()
         result = run_sqlite_query(
             "SELECT o.OrderID, c.Name "
             "FROM Orders o "
-            "CROSS JOIN Customers c "  # 5 * 3 = 15 rows
+            "CROSS JOIN Customers c "  # Every order paired with every customer
         )
-        elapsed = time.time() - start
+        elapsed_ns = perf_counter_ns() - start
 
         # Should complete in under 1 second for small data
-        assert elapsed < 1.0
-        assert isinstance(result, pd.DataFrame)
-        assert len(result) == 15  # 5 orders * 3 customers
+        assert elapsed_ns < 1_000_000_000
+        assert_df(result, rows=ORDER_ROWS * CUSTOMER_ROWS)
 
 
 # ============================================================================
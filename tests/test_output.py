@@ -6,62 +6,45 @@ Tests all output formatting and type conversion functions.
 
 import pytest
 import pandas as pd
-import sys
-import os
 
-# Add current directory to path for imports
-sys.path.insert(0, os.path.dirname(__file__))
-
-# Import ExecutionResult first
 from executor import ExecutionResult
-
-# Patch sys.modules to handle relative import
-import importlib
-import types
-
-# Create a fake parent module to make relative imports work
-fake_parent = types.ModuleType('__fake_parent__')
-sys.modules['__fake_parent__'] = fake_parent
-
-# Import executor into the fake parent
-fake_parent.executor = importlib.import_module('executor')
-
-# Now read and modify output.py to use absolute import
-output_file = os.path.join(os.path.dirname(__file__), "output.py")
-with open(output_file, 'r') as f:
-    output_code = f.read()
-
-# Replace relative import with absolute
-output_code = output_code.replace('from .executor import ExecutionResult', 'from executor import ExecutionResult')
-
-# Execute the modified code
-output_module = types.ModuleType('output')
-exec(output_code, output_module.__dict__)
-
-# Import functions from the module
-format_result = output_module.format_result
-convert_types_for_excel = output_module.convert_types_for_excel
-handle_null_display = output_module.handle_null_display
-format_for_debug = output_module.format_for_debug
-result_to_list_of_lists = output_module.result_to_list_of_lists
-estimate_output_size = output_module.estimate_output_size
-check_output_limits = output_module.check_output_limits
-EXCEL_MAX_ROWS = output_module.EXCEL_MAX_ROWS
-EXCEL_MAX_COLS = output_module.EXCEL_MAX_COLS
-RECOMMENDED_MAX_ROWS = output_module.RECOMMENDED_MAX_ROWS
+from output import (
+    format_result,
+    convert_types_for_excel,
+    handle_null_display,
+    format_for_debug,
+    result_to_list_of_lists,
+    estimate_output_size,
+    check_output_limits,
+    EXCEL_MAX_ROWS,
+    EXCEL_MAX_COLS,
+    RECOMMENDED_MAX_ROWS,
+)
+
+
+def make_result(**fields) -> ExecutionResult:
+    """Build an ExecutionResult, defaulting to an empty SELECT."""
+    fields = {
+        "columns": [],
+        "rows": [],
+        "rowcount": 0,
+        "lastrowid": None,
+        "execution_time_ms": 1.0,
+        "query_type": "SELECT",
+        **fields,
+    }
+    return ExecutionResult(**fields)
 
 
 class TestFormatResult:
     """Tests for format_result() function."""
 
     def test_select_query_with_data(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["id", "name", "value"],
             rows=[(1, "Alice", 100.5), (2, "Bob", 200.0)],
             rowcount=2,
-            lastrowid=None,
-            execution_time_ms=5.0,
-            query_type="SELECT"
+            execution_time_ms=5.0
         )
 
         df = format_result(result, include_headers=True)
@@ -73,108 +56,34 @@ class TestFormatResult:
         assert df.iloc[1]["name"] == "Bob"
 
     def test_empty_select_query(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
-            rowcount=0,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
-        )
+        result = make_result()
 
         df = format_result(result, include_headers=True)
 
         assert isinstance(df, pd.DataFrame)
         assert len(df) == 0
 
-    def test_insert_query(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
-            rowcount=3,
-            lastrowid=10,
-            execution_time_ms=2.0,
-            query_type="INSERT"
-        )
-
-        df = format_result(result, include_headers=True)
-
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) == 1
-        assert df.iloc[0]["Result"] == "3 rows affected"
-
-    def test_update_query(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
-            rowcount=5,
-            lastrowid=None,
-            execution_time_ms=3.0,
-            query_type="UPDATE"
-        )
+    @pytest.mark.parametrize("query_type,rowcount,expected", [
+        ("INSERT", 3, "3 rows affected"),
+        ("UPDATE", 5, "5 rows affected"),
+        ("DELETE", 2, "2 rows affected"),
+        ("CREATE", 0, "OK"),
+        ("DROP", 0, "OK"),
+    ])
+    def test_non_select_query(self, query_type, rowcount, expected):
+        result = make_result(rowcount=rowcount, query_type=query_type)
 
         df = format_result(result, include_headers=True)
 
         assert isinstance(df, pd.DataFrame)
         assert len(df) == 1
-        assert df.iloc[0]["Result"] == "5 rows affected"
-
-    def test_delete_query(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
-            rowcount=2,
-            lastrowid=None,
-            execution_time_ms=1.5,
-            query_type="DELETE"
-        )
-
-        df = format_result(result, include_headers=True)
-
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) == 1
-        assert df.iloc[0]["Result"] == "2 rows affected"
-
-    def test_create_query(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
-            rowcount=0,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="CREATE"
-        )
-
-        df = format_result(result, include_headers=True)
-
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) == 1
-        assert df.iloc[0]["Result"] == "OK"
-
-    def test_drop_query(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
-            rowcount=0,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="DROP"
-        )
-
-        df = format_result(result, include_headers=True)
-
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) == 1
-        assert df.iloc[0]["Result"] == "OK"
+        assert df.iloc[0]["Result"] == expected
 
     def test_with_include_headers_true(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["col1", "col2"],
             rows=[(1, 2), (3, 4)],
-            rowcount=2,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=2
         )
 
         df = format_result(result, include_headers=True)
@@ -183,13 +92,10 @@ class TestFormatResult:
         assert list(df.columns) == ["col1", "col2"]
 
     def test_with_include_headers_false(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["col1", "col2"],
             rows=[(1, 2), (3, 4)],
-            rowcount=2,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=2
         )
 
         df = format_result(result, include_headers=False)
@@ -198,13 +104,10 @@ class TestFormatResult:
         assert list(df.columns) == ["col1", "col2"]
 
     def test_type_conversion_applied(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["int_col", "float_col", "text_col"],
             rows=[(1, 1.5, "text"), (2, 2.5, "more")],
-            rowcount=2,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=2
         )
 
         df = format_result(result, include_headers=True)
@@ -269,6 +172,36 @@ class TestConvertTypesForExcel:
         # Should convert to integer type
         assert result["col"].dtype in [int, 'int64', 'Int64']
 
+    def test_large_integers_with_nulls_exact(self):
+        # Beyond float64 precision, so must not pass through a float column
+        big = 2**62 + 1
+        df = pd.DataFrame({"col": pd.Series([big, None], dtype=object)})
+        result = convert_types_for_excel(df)
+
+        assert result["col"].dtype == 'Int64'
+        assert result.iloc[0]["col"] == big
+        assert pd.isna(result.iloc[1]["col"])
+
+    def test_integers_beyond_int64_fall_back_to_float(self):
+        df = pd.DataFrame({"col": pd.Series([2**70, 1], dtype=object)})
+        result = convert_types_for_excel(df)
+
+        assert result["col"].dtype == float
+        assert result.iloc[0]["col"] == float(2**70)
+
+    def test_integral_floats_beyond_int64_stay_float(self):
+        df = pd.DataFrame({"col": [1e20, -1e19]})
+        result = convert_types_for_excel(df)
+
+        assert result["col"].dtype == float
+        assert result["col"].tolist() == [1e20, -1e19]
+
+    def test_infinity_stays_float(self):
+        df = pd.DataFrame({"col": [1.0, float("inf"), None]})
+        result = convert_types_for_excel(df)
+
+        assert result["col"].dtype == float
+
     def test_mixed_int_and_float(self):
         df = pd.DataFrame({"col": [1, 2.5, 3]})
         result = convert_types_for_excel(df)
@@ -360,13 +293,11 @@ class TestFormatForDebug:
     """Tests for format_for_debug() function."""
 
     def test_select_query(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["id", "name"],
             rows=[(1, "Alice"), (2, "Bob")],
             rowcount=2,
-            lastrowid=None,
-            execution_time_ms=5.5,
-            query_type="SELECT"
+            execution_time_ms=5.5
         )
 
         debug_str = format_for_debug(result)
@@ -377,9 +308,7 @@ class TestFormatForDebug:
         assert "Row count: 2" in debug_str
 
     def test_insert_query(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
+        result = make_result(
             rowcount=3,
             lastrowid=42,
             execution_time_ms=2.3,
@@ -395,13 +324,11 @@ class TestFormatForDebug:
 
     def test_many_rows_shows_sample(self):
         rows = [(i, f"name{i}") for i in range(10)]
-        result = ExecutionResult(
+        result = make_result(
             columns=["id", "name"],
             rows=rows,
             rowcount=10,
-            lastrowid=None,
-            execution_time_ms=10.0,
-            query_type="SELECT"
+            execution_time_ms=10.0
         )
 
         debug_str = format_for_debug(result)
@@ -410,13 +337,10 @@ class TestFormatForDebug:
         assert "... (5 more rows)" in debug_str
 
     def test_few_rows_shows_all(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["id"],
             rows=[(1,), (2,), (3,)],
-            rowcount=3,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=3
         )
 
         debug_str = format_for_debug(result)
@@ -429,13 +353,10 @@ class TestResultToListOfLists:
     """Tests for result_to_list_of_lists() function."""
 
     def test_with_headers(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["id", "name"],
             rows=[(1, "Alice"), (2, "Bob")],
-            rowcount=2,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=2
         )
 
         lists = result_to_list_of_lists(result, include_headers=True)
@@ -446,13 +367,10 @@ class TestResultToListOfLists:
         assert len(lists) == 3
 
     def test_without_headers(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["id", "name"],
             rows=[(1, "Alice"), (2, "Bob")],
-            rowcount=2,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=2
         )
 
         lists = result_to_list_of_lists(result, include_headers=False)
@@ -462,28 +380,14 @@ class TestResultToListOfLists:
         assert len(lists) == 2
 
     def test_empty_result(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
-            rowcount=0,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
-        )
+        result = make_result()
 
         lists = result_to_list_of_lists(result, include_headers=True)
 
         assert lists == []
 
     def test_single_row(self):
-        result = ExecutionResult(
-            columns=["value"],
-            rows=[(42,)],
-            rowcount=1,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
-        )
+        result = make_result(columns=["value"], rows=[(42,)], rowcount=1)
 
         lists = result_to_list_of_lists(result, include_headers=True)
 
@@ -491,13 +395,10 @@ class TestResultToListOfLists:
         assert lists[1] == [42]
 
     def test_tuples_converted_to_lists(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["a", "b"],
             rows=[(1, 2), (3, 4)],
-            rowcount=2,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=2
         )
 
         lists = result_to_list_of_lists(result, include_headers=False)
@@ -510,13 +411,10 @@ class TestEstimateOutputSize:
     """Tests for estimate_output_size() function."""
 
     def test_basic_calculation(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["a", "b", "c"],
             rows=[(1, 2, 3), (4, 5, 6)],
-            rowcount=2,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=2
         )
 
         size = estimate_output_size(result)
@@ -526,15 +424,8 @@ class TestEstimateOutputSize:
         assert size["cell_count"] == 6
 
     def test_large_result(self):
-        rows = [(i,) for i in range(1000)]
-        result = ExecutionResult(
-            columns=["id"],
-            rows=rows,
-            rowcount=1000,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
-        )
+        # Only the row count is inspected, so the rows needn't exist
+        result = make_result(columns=["id"], rows=(), rowcount=1000)
 
         size = estimate_output_size(result)
 
@@ -543,14 +434,7 @@ class TestEstimateOutputSize:
         assert size["cell_count"] == 1000
 
     def test_empty_result(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
-            rowcount=0,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
-        )
+        result = make_result()
 
         size = estimate_output_size(result)
 
@@ -558,18 +442,23 @@ class TestEstimateOutputSize:
         assert size["column_count"] == 0
         assert size["cell_count"] == 0
 
+    def test_dml_result_has_no_output_rows(self):
+        result = make_result(rowcount=5, query_type="UPDATE")
+
+        size = estimate_output_size(result)
+
+        assert size["row_count"] == 0
+        assert size["cell_count"] == 0
+
 
 class TestCheckOutputLimits:
     """Tests for check_output_limits() function."""
 
     def test_small_result_no_warning(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["a", "b"],
             rows=[(i, i*2) for i in range(100)],
-            rowcount=100,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=100
         )
 
         warning = check_output_limits(result)
@@ -577,15 +466,9 @@ class TestCheckOutputLimits:
         assert warning is None
 
     def test_exceeds_recommended_max(self):
-        rows = [(i,) for i in range(RECOMMENDED_MAX_ROWS + 1000)]
-        result = ExecutionResult(
-            columns=["id"],
-            rows=rows,
-            rowcount=len(rows),
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
-        )
+        # Only the row count is inspected, so the rows needn't exist
+        row_count = RECOMMENDED_MAX_ROWS + 1000
+        result = make_result(columns=["id"], rows=(), rowcount=row_count)
 
         warning = check_output_limits(result)
 
@@ -593,17 +476,14 @@ class TestCheckOutputLimits:
         assert "Warning" in warning
         assert "Consider using LIMIT clause" in warning
         # Number is formatted with commas (e.g., "101,000")
-        assert f"{len(rows):,}" in warning
+        assert f"{row_count:,}" in warning
 
     def test_exceeds_excel_max_rows(self):
         # Create a result that exceeds Excel's row limit
-        result = ExecutionResult(
+        result = make_result(
             columns=["id"],
-            rows=[(i,) for i in range(EXCEL_MAX_ROWS + 100)],
-            rowcount=EXCEL_MAX_ROWS + 100,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rows=(),
+            rowcount=EXCEL_MAX_ROWS + 100
         )
 
         warning = check_output_limits(result)
@@ -615,13 +495,10 @@ class TestCheckOutputLimits:
     def test_exceeds_excel_max_cols(self):
         # Create many columns
         columns = [f"col{i}" for i in range(EXCEL_MAX_COLS + 10)]
-        result = ExecutionResult(
+        result = make_result(
             columns=columns,
             rows=[(i for i in range(len(columns)))],
-            rowcount=1,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=1
         )
 
         warning = check_output_limits(result)
@@ -631,14 +508,10 @@ class TestCheckOutputLimits:
         assert "exceeding Excel's limit" in warning
 
     def test_at_recommended_limit_no_warning(self):
-        rows = [(i,) for i in range(RECOMMENDED_MAX_ROWS)]
-        result = ExecutionResult(
+        result = make_result(
             columns=["id"],
-            rows=rows,
-            rowcount=len(rows),
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rows=(),
+            rowcount=RECOMMENDED_MAX_ROWS
         )
 
         warning = check_output_limits(result)
@@ -647,13 +520,17 @@ class TestCheckOutputLimits:
         assert warning is None
 
     def test_empty_result_no_warning(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
-            rowcount=0,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+        result = make_result()
+
+        warning = check_output_limits(result)
+
+        assert warning is None
+
+    def test_large_dml_rowcount_no_warning(self):
+        # Affected-row counts aren't output rows
+        result = make_result(
+            rowcount=EXCEL_MAX_ROWS + 100,
+            query_type="UPDATE"
         )
 
         warning = check_output_limits(result)
@@ -678,13 +555,11 @@ class TestIntegrationScenarios:
 
     def test_complete_select_workflow(self):
         # Simulate a complete query result workflow
-        result = ExecutionResult(
+        result = make_result(
             columns=["id", "name", "value"],
             rows=[(1, "Alice", 100), (2, "Bob", 200), (3, None, 300)],
             rowcount=3,
-            lastrowid=None,
-            execution_time_ms=5.5,
-            query_type="SELECT"
+            execution_time_ms=5.5
         )
 
         # Format for Excel
@@ -700,9 +575,7 @@ class TestIntegrationScenarios:
         assert size["cell_count"] == 9
 
     def test_complete_dml_workflow(self):
-        result = ExecutionResult(
-            columns=[],
-            rows=[],
+        result = make_result(
             rowcount=5,
             lastrowid=10,
             execution_time_ms=2.0,
@@ -717,13 +590,10 @@ class TestIntegrationScenarios:
         assert "Last row ID: 10" in debug
 
     def test_type_conversion_integration(self):
-        result = ExecutionResult(
+        result = make_result(
             columns=["int_val", "float_val", "text_val"],
             rows=[(1, 1.5, "a"), (2, 2.5, "b")],
-            rowcount=2,
-            lastrowid=None,
-            execution_time_ms=1.0,
-            query_type="SELECT"
+            rowcount=2
         )
 
         df = format_result(result, include_headers=True)
@@ -8,6 +8,7 @@ from parser import (
     substitute_references,
     is_parameterized_query,
     count_parameters,
+    clear_cache,
     TableReference
 )
 
@@ -62,6 +63,18 @@ def test_parse_cross_sheet_range():
     print("[PASS] test_parse_cross_sheet_range")
 
 
+def test_parse_reference_cached():
+    """Test that repeated references reuse the parsed TableReference"""
+    ref = parse_reference("Sheet1.Orders")
+    assert parse_reference("Sheet1.Orders") is ref
+
+    clear_cache()
+    fresh = parse_reference("Sheet1.Orders")
+    assert fresh is not ref
+    assert fresh == ref
+    print("[PASS] test_parse_reference_cached")
+
+
 def test_extract_simple_query():
     """Test extracting references from a simple query"""
     query = "SELECT * FROM Orders"
@@ -168,6 +181,7 @@ def test_extract_cte():
     table_names = {ref.table_name for ref in refs}
     assert "Orders" in table_names
     assert "Customers" in table_names
+    assert "top_orders" not in table_names
     print("[PASS] test_extract_cte")
 
 
@@ -187,6 +201,7 @@ if __name__ == "__main__":
     test_parse_quoted_sheet_table()
     test_parse_simple_range()
     test_parse_cross_sheet_range()
+    test_parse_reference_cached()
     test_extract_simple_query()
     test_extract_join_query()
     test_extract_sheet_qualified()
@@ -111,6 +111,39 @@ def test_substitute_sheet_qualified_multiple():
     print("[PASS] test_substitute_sheet_qualified_multiple")
 
 
+def test_substitute_case_insensitive_single_pass():
+    """Test that references match in any case and are replaced only once"""
+    query = "SELECT * FROM orders JOIN Sheet1.ORDERS ON 1"
+    mapping = {
+        "Orders": "sheet1_orders",
+        "Sheet1.Orders": "orders"
+    }
+    result = substitute_references(query, mapping)
+    assert result == "SELECT * FROM sheet1_orders JOIN orders ON 1"
+    print("[PASS] test_substitute_case_insensitive_single_pass")
+
+
+def test_substitute_skips_string_literals():
+    """Test that references inside strings and comments aren't rewritten"""
+    query = "SELECT * FROM Orders WHERE note = 'Orders' -- from Orders"
+    mapping = {"Orders": "orders_temp"}
+    result = substitute_references(query, mapping)
+    assert result == "SELECT * FROM orders_temp WHERE note = 'Orders' -- from Orders"
+    print("[PASS] test_substitute_skips_string_literals")
+
+
+def test_substitute_quoted_and_absolute():
+    """Test substituting references that start with a quote or $"""
+    query = 'SELECT * FROM "Order Details" JOIN $A$1:$M$100 ON 1'
+    mapping = {
+        '"Order Details"': "order_details",
+        "$A$1:$M$100": "a1_m100"
+    }
+    result = substitute_references(query, mapping)
+    assert result == "SELECT * FROM order_details JOIN a1_m100 ON 1"
+    print("[PASS] test_substitute_quoted_and_absolute")
+
+
 def test_parse_quoted_table_name():
     """Test parsing double-quoted table name"""
     ref = parse_reference('"My Table"')
@@ -147,9 +180,21 @@ def test_complex_cte():
     assert "Customers" in table_names
     assert "Orders" in table_names
     assert "Products" in table_names
+    assert not table_names & {"top_customers", "recent_orders"}
     print("[PASS] test_complex_cte")
 
 
+def test_window_definitions_not_cte():
+    """Test that named windows aren't mistaken for CTE names"""
+    query = """
+    SELECT sum(amount) OVER w FROM totals
+    WINDOW w AS (ORDER BY id), totals AS (w ROWS 1 PRECEDING)
+    """
+    refs = extract_table_references(query)
+    assert [ref.table_name for ref in refs] == ["totals"]
+    print("[PASS] test_window_definitions_not_cte")
+
+
 def test_comment_in_query():
     """Test that SQL comments don't interfere with parsing"""
     query = """
@@ -165,6 +210,47 @@ def test_comment_in_query():
     print("[PASS] test_comment_in_query")
 
 
+def test_comment_after_keyword():
+    """Test that a comment between FROM/JOIN and the reference is skipped"""
+    for query in [
+        "SELECT * FROM /* c */ Orders",
+        "SELECT * FROM -- c\n Orders",
+        "SELECT * FROM Customers JOIN /* c */ Orders ON 1",
+    ]:
+        refs = extract_table_references(query)
+        assert "Orders" in {ref.table_name for ref in refs}, query
+    print("[PASS] test_comment_after_keyword")
+
+
+def test_whitespace_after_separator():
+    """Test that whitespace after "." or "!" isn't part of the reference"""
+    refs = extract_table_references("SELECT * FROM Sheet1.\n  Orders")
+    assert refs[0].original == "Sheet1.Orders"
+    assert refs[0].sheet_name == "Sheet1"
+    assert refs[0].table_name == "Orders"
+
+    refs = extract_table_references("SELECT * FROM Sheet1. Orders")
+    assert refs[0].table_name == "Orders"
+
+    refs = extract_table_references("SELECT * FROM Sheet2! A1:B5")
+    assert refs[0].sheet_name == "Sheet2"
+    assert refs[0].range_ref == "A1:B5"
+    assert refs[0].table_name is None
+    print("[PASS] test_whitespace_after_separator")
+
+
+def test_quote_in_comment():
+    """Test that a quote inside a comment doesn't start a string literal"""
+    query = """
+    -- don't load anything else
+    SELECT * FROM Orders JOIN Customers ON Orders.customer_id = Customers.id
+    """
+    refs = extract_table_references(query)
+    table_names = {ref.table_name for ref in refs}
+    assert table_names == {"Orders", "Customers"}
+    print("[PASS] test_quote_in_comment")
+
+
 def test_string_with_keyword():
     """Test that keywords in strings don't create false positives"""
     query = "SELECT * FROM Orders WHERE note = 'JOIN the team'"
@@ -183,6 +269,17 @@ def test_escaped_quotes_in_string():
     print("[PASS] test_escaped_quotes_in_string")
 
 
+def test_parameters_in_comments_ignored():
+    """Test that ? inside comments isn't counted as a parameter"""
+    from parser import count_parameters
+    query = """
+    -- which customer?
+    SELECT * FROM Orders /* filter? */ WHERE id = ?
+    """
+    assert count_parameters(query) == 1
+    print("[PASS] test_parameters_in_comments_ignored")
+
+
 if __name__ == "__main__":
     # Run all tests
     test_absolute_range()
@@ -194,11 +291,19 @@ if __name__ == "__main__":
     test_case_insensitive_keywords()
     test_substitute_multiple()
     test_substitute_sheet_qualified_multiple()
+    test_substitute_case_insensitive_single_pass()
+    test_substitute_skips_string_literals()
+    test_substitute_quoted_and_absolute()
     test_parse_quoted_table_name()
     test_range_starting_with_number()
     test_complex_cte()
+    test_window_definitions_not_cte()
     test_comment_in_query()
+    test_comment_after_keyword()
+    test_whitespace_after_separator()
+    test_quote_in_comment()
     test_string_with_keyword()
     test_escaped_quotes_in_string()
+    test_parameters_in_comments_ignored()
 
     print("\n[SUCCESS] All edge case tests passed!")
@@ -60,6 +60,11 @@ class TestInferColumnType:
         series = pd.Series([1.0, 2.0, 3.0, 4.0])
         assert infer_column_type(series) == SQLITE_INTEGER
 
+    def test_whole_floats_beyond_int64(self):
+        """Whole floats too large for a 64-bit integer should return REAL."""
+        series = pd.Series([1e20, -1e19])
+        assert infer_column_type(series) == SQLITE_REAL
+
     def test_mixed_numeric(self):
         """Mixed integers and floats with decimals should return REAL type."""
         series = pd.Series([1, 2.5, 3, 4.7, 5])
@@ -563,6 +568,22 @@ class TestLoadDataToSQLite:
         assert count == 5
         assert count == len(df)
 
+    def test_all_integer_columns_stored_as_integers(self, conn):
+        """Frames without object columns should still store native integers."""
+        df = pd.DataFrame({
+            'id': [1, 2, 3],
+            'value': [10, 20, 30]
+        })
+
+        schema = build_table_schema(df, "numbers")
+        load_data_to_sqlite(conn, schema, df)
+
+        cursor = conn.execute("SELECT id, value, typeof(value) FROM numbers ORDER BY id")
+        rows = cursor.fetchall()
+
+        assert rows[0] == (1, 10, 'integer')
+        assert rows[2] == (3, 30, 'integer')
+
     def test_quoted_column_names_work(self, conn):
         """Quoted column names should work correctly."""
         df = pd.DataFrame({
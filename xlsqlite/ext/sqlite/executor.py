@@ -9,12 +9,37 @@ This module handles:
 """
 
 from dataclasses import dataclass
+from functools import cache
 from typing import Optional, Any
+import re
 import sqlite3
 import time
 
 
-@dataclass
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Helper threads SQLite may use for sorting large result sets
+SORTER_THREADS = 4
+
+# Leading keyword -> query type reported by detect_query_type()
+_QUERY_TYPES = {
+    keyword: keyword
+    for keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "PRAGMA", "EXPLAIN")
+}
+
+_FIRST_WORD = re.compile(r'\s*([A-Za-z]+)')
+_SELECT_WORD = re.compile(r'\bSELECT\b', re.IGNORECASE)
+
+# Statements that start or end a transaction; executescript() commits first
+# and then runs in autocommit mode, which would change what they do
+_TRANSACTION_CONTROL = re.compile(
+    r'(?:\s|--[^\n]*|/\*.*?\*/)*(?:BEGIN|COMMIT|END|ROLLBACK|SAVEPOINT|RELEASE)\b',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+@dataclass(frozen=True, slots=True)
 class ExecutionResult:
     """
     Result of SQL query execution.
@@ -55,11 +80,20 @@ def create_connection() -> sqlite3.Connection:
     Returns:
         Configured sqlite3.Connection
     """
-    conn = sqlite3.connect(":memory:")
+    # Repeated query shapes reuse the compiled statement instead of re-parsing
+    conn = sqlite3.connect(":memory:", cached_statements=STATEMENT_CACHE_SIZE)
     
     # Enable foreign keys
     conn.execute("PRAGMA foreign_keys = ON")
     
+    # Keep sorter and temp b-trees (ORDER BY, GROUP BY, DISTINCT, temp
+    # tables) in memory rather than spilling to temporary files
+    conn.execute("PRAGMA temp_store = MEMORY")
+    
+    # ORDER BY ... LIMIT already uses a bounded top-K sorter; full sorts of
+    # large results may also spread their merge work over helper threads
+    conn.execute(f"PRAGMA threads = {SORTER_THREADS}")
+    
     # Return rows as tuples (default, but explicit)
     conn.row_factory = None
     
@@ -76,23 +110,21 @@ def detect_query_type(query: str) -> str:
     Returns:
         Query type: SELECT, INSERT, UPDATE, DELETE, CREATE, DROP, PRAGMA, EXPLAIN, OTHER
     """
-    # Strip whitespace and get first word
-    stripped = query.strip().upper()
+    # Skip leading whitespace and get first word
+    match = _FIRST_WORD.match(query)
+    if not match:
+        return "OTHER"
+    
+    keyword = match.group(1).upper()
     
     # Handle WITH (CTE) - look for the main query after
-    if stripped.startswith("WITH"):
-        # Find the main statement after the CTE
+    if keyword == "WITH":
         # This is simplified - CTEs are usually followed by SELECT
-        if "SELECT" in stripped:
+        if _SELECT_WORD.search(query, match.end()):
             return "SELECT"
         return "OTHER"
     
-    # Check common statement types
-    for keyword in ["SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "PRAGMA", "EXPLAIN"]:
-        if stripped.startswith(keyword):
-            return keyword
-    
-    return "OTHER"
+    return _QUERY_TYPES.get(keyword, "OTHER")
 
 
 def execute_query(
@@ -167,7 +199,7 @@ def execute_multiple_statements(
     Returns:
         ExecutionResult from the last relevant statement
     """
-    # Split statements (simple approach - doesn't handle semicolons in strings)
+    # Split on the semicolons SQLite treats as statement terminators
     statements = split_statements(sql)
     
     if not statements:
@@ -183,8 +215,18 @@ def execute_multiple_statements(
     last_select_result: Optional[ExecutionResult] = None
     last_result: Optional[ExecutionResult] = None
     total_time_ms = 0
-    
-    for i, stmt in enumerate(statements):
+    first = 0
+    
+    # Leading statements whose rows are never returned can run as a single
+    # script in C; only the final statement needs a result set captured.
+    # Each ";" goes on its own line so a trailing -- comment can't swallow it
+    if _can_run_as_script(statements, params_list):
+        start_time = time.perf_counter()
+        conn.executescript("\n;\n".join(statements[:-1]) + "\n;")
+        total_time_ms += (time.perf_counter() - start_time) * 1000
+        first = len(statements) - 1
+    
+    for i, stmt in enumerate(statements[first:], start=first):
         stmt = stmt.strip()
         if not stmt:
             continue
@@ -223,11 +265,40 @@ def execute_multiple_statements(
     )
 
 
+def _can_run_as_script(
+    statements: list[str],
+    params_list: Optional[list[tuple]]
+) -> bool:
+    """
+    Check whether all but the last statement can go through executescript().
+    
+    That is only possible when none of the leading statements take
+    parameters or control transactions, and none of them is a SELECT whose
+    rows would be returned (i.e. the final statement is itself a SELECT, or
+    there are no SELECTs).
+    """
+    if len(statements) < 2:
+        return False
+    
+    leading = statements[:-1]
+    if params_list and any(params_list[:len(leading)]):
+        return False
+    
+    if any(_TRANSACTION_CONTROL.match(stmt) for stmt in leading):
+        return False
+    
+    if detect_query_type(statements[-1]) == "SELECT":
+        return True
+    return not any(detect_query_type(stmt) == "SELECT" for stmt in leading)
+
+
 def split_statements(sql: str) -> list[str]:
     """
     Split SQL into individual statements.
     
-    Handles semicolons inside string literals.
+    Only semicolons that SQLite itself considers statement terminators
+    split the input, so semicolons inside string literals, quoted
+    identifiers, comments and CREATE TRIGGER bodies are left alone.
     
     Args:
         sql: SQL string with potentially multiple statements
@@ -236,42 +307,21 @@ def split_statements(sql: str) -> list[str]:
         List of individual statements
     """
     statements = []
-    current = []
-    in_string = False
-    string_char = None
-    
-    i = 0
-    while i < len(sql):
-        char = sql[i]
-        
-        # Handle string literals
-        if char in ("'", '"') and not in_string:
-            in_string = True
-            string_char = char
-            current.append(char)
-        elif char == string_char and in_string:
-            # Check for escaped quote
-            if i + 1 < len(sql) and sql[i + 1] == string_char:
-                current.append(char)
-                current.append(char)
-                i += 1
-            else:
-                in_string = False
-                string_char = None
-                current.append(char)
-        elif char == ';' and not in_string:
-            # Statement separator
-            stmt = ''.join(current).strip()
+    start = 0
+    end = sql.find(';')
+    
+    while end != -1:
+        # sqlite3.complete_statement() runs SQLite's own tokenizer, so only
+        # the candidate terminators need checking rather than every character
+        if sqlite3.complete_statement(sql[start:end + 1]):
+            stmt = sql[start:end].strip()
             if stmt:
                 statements.append(stmt)
-            current = []
-        else:
-            current.append(char)
-        
-        i += 1
+            start = end + 1
+        end = sql.find(';', end + 1)
     
     # Don't forget the last statement
-    stmt = ''.join(current).strip()
+    stmt = sql[start:].strip()
     if stmt:
         statements.append(stmt)
     
@@ -331,21 +381,27 @@ def get_sqlite_version() -> str:
     Returns:
         Version string (e.g., "3.35.4")
     """
-    conn = sqlite3.connect(":memory:")
-    cursor = conn.cursor()
-    cursor.execute("SELECT sqlite_version()")
-    version = cursor.fetchone()[0]
-    conn.close()
-    return version
+    # Version of the linked library, same as SELECT sqlite_version()
+    return sqlite3.sqlite_version
 
 
 def check_feature_support() -> dict[str, bool]:
     """
     Check which SQLite features are available.
     
+    The library can't change while the process runs, so the probe only
+    runs once.
+    
     Returns:
         Dict of feature_name -> is_supported
     """
+    # Copy so callers can't modify the cached result
+    return dict(_probe_features())
+
+
+@cache
+def _probe_features() -> dict[str, bool]:
+    """Run the feature probes against a scratch connection."""
     features = {}
     conn = sqlite3.connect(":memory:")
     cursor = conn.cursor()
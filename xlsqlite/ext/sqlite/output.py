@@ -9,9 +9,11 @@ This module handles:
 """
 
 from typing import Optional, Any
+import numpy as np
 import pandas as pd
 
 from .executor import ExecutionResult
+from .schema import is_integral
 
 
 def format_result(
@@ -41,7 +43,10 @@ def format_result(
             return pd.DataFrame()
     
     # Create DataFrame from rows
-    df = pd.DataFrame(result.rows, columns=result.columns)
+    df = pd.DataFrame.from_records(
+        result.rows, columns=result.columns, coerce_float=False
+    )
+    _restore_large_integers(df, result.rows)
     
     # Convert types for Excel compatibility
     df = convert_types_for_excel(df)
@@ -49,6 +54,24 @@ def format_result(
     return df
 
 
+def _restore_large_integers(df: pd.DataFrame, rows: list[tuple]) -> None:
+    """
+    Undo float64 widening of integer columns that would lose precision.
+    
+    from_records() turns integer columns with NULLs into float64, which
+    rounds integers beyond 2**53. Such columns are rebuilt from the raw
+    values as object columns so convert_types_for_excel() can make them
+    Int64 exactly.
+    """
+    for i, dtype in enumerate(df.dtypes):
+        if dtype != np.float64 or not df.iloc[:, i].hasnans:
+            continue
+        
+        values = [row[i] for row in rows]
+        if any(type(v) is int and abs(v) > _FLOAT_EXACT_LIMIT for v in values):
+            df.isetitem(i, pd.Series(values, index=df.index, dtype=object))
+
+
 def convert_types_for_excel(df: pd.DataFrame) -> pd.DataFrame:
     """
     Convert DataFrame types for optimal Excel display.
@@ -74,35 +97,76 @@ def convert_types_for_excel(df: pd.DataFrame) -> pd.DataFrame:
         if series.isna().all():
             continue
         
-        # Try to infer best type
-        non_null = series.dropna()
+        # Kind of the non-null values, e.g. 'integer', 'floating', 'string'
+        kind = pd.api.types.infer_dtype(series, skipna=True)
         
-        if len(non_null) == 0:
-            continue
+        # Only numbers with a fractional part decide between Int64 and float
+        all_integral = False
+        if kind in _FRACTIONAL_KINDS:
+            all_integral = is_integral(series.dropna().to_numpy(dtype=float))
         
-        # Check if all integers
-        try:
-            if all(isinstance(x, (int, float)) and float(x).is_integer() 
-                   for x in non_null):
-                # Convert to nullable integer
-                result[col] = series.astype('Int64')  # Nullable integer
-                continue
-        except (ValueError, TypeError):
-            pass
+        target = _decide_target_dtype(kind, all_integral)
+        if target is None:
+            # Keep as-is (likely string or mixed)
+            continue
         
-        # Check if all numeric
-        try:
-            if all(isinstance(x, (int, float)) for x in non_null):
-                result[col] = series.astype(float)
+        if target == "Int64":
+            try:
+                result[col] = _to_nullable_int(series)
                 continue
-        except (ValueError, TypeError):
-            pass
+            except (ValueError, TypeError, OverflowError):
+                # e.g. Python ints beyond the int64 range - fall back to float
+                pass
         
-        # Keep as-is (likely string or mixed)
+        result[col] = series.astype(float)
     
     return result
 
 
+def _to_nullable_int(series: pd.Series) -> pd.Series:
+    """
+    Build a nullable Int64 column straight from int64 values and a null mask.
+    
+    Args:
+        series: Column whose non-null values are all integral
+        
+    Returns:
+        Int64 Series with the same index and name
+    """
+    mask = series.isna().to_numpy()
+    values = series.to_numpy(dtype=np.int64, na_value=0)
+    return pd.Series(
+        pd.arrays.IntegerArray(values, mask),
+        index=series.index,
+        name=series.name
+    )
+
+
+# infer_dtype() kinds whose values may have a fractional part
+_FRACTIONAL_KINDS = frozenset({"floating", "mixed-integer-float"})
+
+# Integers beyond this magnitude can't all be represented as float64
+_FLOAT_EXACT_LIMIT = 2 ** 53
+
+
+def _decide_target_dtype(kind: str, all_integral: bool) -> Optional[str]:
+    """
+    Pick the Excel-friendly dtype for a column.
+    
+    Args:
+        kind: pandas infer_dtype() result for the column's non-null values
+        all_integral: Whether every value has no fractional part
+        
+    Returns:
+        Target dtype, or None to keep the column as-is
+    """
+    if kind in ("integer", "boolean"):
+        return "Int64"  # Nullable integer, see _to_nullable_int()
+    if kind in _FRACTIONAL_KINDS:
+        return "Int64" if all_integral else "float"
+    return None
+
+
 def handle_null_display(
     df: pd.DataFrame,
     null_repr: Optional[str] = None
@@ -153,8 +217,7 @@ def format_for_debug(result: ExecutionResult) -> str:
         # Show first few rows
         if result.rows:
             lines.append("\nSample rows:")
-            for i, row in enumerate(result.rows[:5]):
-                lines.append(f"  {row}")
+            lines.extend(f"  {row}" for row in result.rows[:5])
             if len(result.rows) > 5:
                 lines.append(f"  ... ({len(result.rows) - 5} more rows)")
     else:
@@ -184,13 +247,8 @@ def result_to_list_of_lists(
     if not result.columns:
         return []
     
-    rows = []
-    
-    if include_headers:
-        rows.append(list(result.columns))
-    
-    for row in result.rows:
-        rows.append(list(row))
+    rows = [list(result.columns)] if include_headers else []
+    rows.extend(map(list, result.rows))
     
     return rows
 
@@ -205,13 +263,26 @@ def estimate_output_size(result: ExecutionResult) -> dict[str, int]:
     Returns:
         Dict with row_count, column_count, cell_count
     """
+    row_count = _output_row_count(result)
+    col_count = len(result.columns)
+    
     return {
-        "row_count": len(result.rows),
-        "column_count": len(result.columns),
-        "cell_count": len(result.rows) * len(result.columns)
+        "row_count": row_count,
+        "column_count": col_count,
+        "cell_count": row_count * col_count
     }
 
 
+def _output_row_count(result: ExecutionResult) -> int:
+    """
+    Number of rows the result will output, without touching result.rows.
+    
+    rowcount already holds len(rows) for result sets; DML results carry
+    the affected-row count there instead, which isn't output.
+    """
+    return result.rowcount if result.columns else 0
+
+
 # Excel limits
 EXCEL_MAX_ROWS = 1_048_576
 EXCEL_MAX_COLS = 16_384
@@ -228,7 +299,7 @@ def check_output_limits(result: ExecutionResult) -> Optional[str]:
     Returns:
         Warning message if limits exceeded, None otherwise
     """
-    row_count = len(result.rows)
+    row_count = _output_row_count(result)
     col_count = len(result.columns)
     
     if row_count > EXCEL_MAX_ROWS:
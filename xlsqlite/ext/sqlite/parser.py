@@ -8,11 +8,21 @@ This module handles:
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 import re
 
 
-@dataclass
+# Lexical pieces SQLite skips over when scanning a query for keywords and
+# placeholders: comments and quoted text (quotes are escaped by doubling them).
+# An unterminated comment, literal or identifier runs to the end of the query.
+_COMMENT = r"--[^\n]*|/\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/)?"
+_STRING_LITERAL = r"'[^']*(?:''[^']*)*'?"
+_QUOTED_IDENTIFIER = r'"[^"]*(?:""[^"]*)*"?'
+_SKIPPED = f"{_COMMENT}|{_STRING_LITERAL}|{_QUOTED_IDENTIFIER}"
+
+
+@dataclass(frozen=True, slots=True)
 class TableReference:
     """
     Represents a reference to Excel data within a SQL query.
@@ -53,6 +63,8 @@ def extract_table_references(query: str) -> list[TableReference]:
     - Absolute refs: $A$1:$M$100
     - Quoted sheet names: 'Sheet Name'.Table1
 
+    Names defined by a WITH clause are not returned.
+
     Args:
         query: SQL query string
 
@@ -61,65 +73,72 @@ def extract_table_references(query: str) -> list[TableReference]:
 
     TODO: Implement full parsing logic
     """
-    # Remove comments and string literals to avoid false matches
-    cleaned_query = _remove_string_literals(query)
-    cleaned_query = _remove_comments(cleaned_query)
+    return list(_iter_table_references(query))
+
+
+def _iter_table_references(query: str) -> Iterator[TableReference]:
+    """
+    Lazily yield the references extract_table_references() returns.
+
+    Args:
+        query: SQL query string
 
-    references = []
+    Yields:
+        Each distinct TableReference, in query order
+    """
     seen = set()
+    cte_names = set()
+
+    # One pass over the query; comments and string literals are skipped by
+    # the tokenizer, so keywords inside them don't produce references
+    for kind, text in _tokenize_sql(query):
+        if kind == 'cte':
+            # Remove quotes if present
+            if text.startswith('"'):
+                text = text[1:-1].replace('""', '"')
+            cte_names.add(text.lower())
+            continue
+
+        if text in seen:
+            continue
+
+        try:
+            ref = parse_reference(text)
+        except ValueError:
+            # Skip invalid references
+            continue
+        seen.add(text)
+
+        # CTEs are defined by the query itself, not in Excel
+        if (ref.sheet_name is None and ref.is_named_table
+                and ref.table_name.lower() in cte_names):
+            continue
+
+        yield ref
+
 
-    # Pattern for SQL keywords that precede table references
-    # Matches: FROM, JOIN (including LEFT JOIN, INNER JOIN, etc.)
-    table_keyword_pattern = r'\b(?:FROM|JOIN)\s+'
-
-    # Find all positions where table references should appear
-    # Extract from the cleaned query to get the reference text
-    matches = re.finditer(table_keyword_pattern, cleaned_query, re.IGNORECASE)
-
-    for match in matches:
-        start_pos = match.end()
-        # Extract from cleaned query, not original
-        ref_text = _extract_reference_at_position(cleaned_query, start_pos)
-
-        if ref_text and ref_text not in seen:
-            try:
-                ref = parse_reference(ref_text)
-                references.append(ref)
-                seen.add(ref_text)
-            except ValueError:
-                # Skip invalid references
-                pass
-
-    # Also check for references in UPDATE and INSERT INTO statements
-    update_pattern = r'\bUPDATE\s+([^\s,;]+)'
-    for match in re.finditer(update_pattern, cleaned_query, re.IGNORECASE):
-        ref_text = match.group(1).strip()
-        if ref_text and ref_text not in seen:
-            try:
-                ref = parse_reference(ref_text)
-                references.append(ref)
-                seen.add(ref_text)
-            except ValueError:
-                pass
-
-    insert_pattern = r'\bINSERT\s+INTO\s+([^\s,;(]+)'
-    for match in re.finditer(insert_pattern, cleaned_query, re.IGNORECASE):
-        ref_text = match.group(1).strip()
-        if ref_text and ref_text not in seen:
-            try:
-                ref = parse_reference(ref_text)
-                references.append(ref)
-                seen.add(ref_text)
-            except ValueError:
-                pass
-
-    return references
+# Pattern for cell range: A1:M100, $A$1:$M$100, etc.
+# Excel ranges have letters for columns and numbers for rows
+_RANGE_PATTERN = re.compile(r'\$?[A-Z]+\$?\d+:\$?[A-Z]+\$?\d+', re.IGNORECASE)
 
+# Pattern for cross-sheet range: Sheet1!A1:B10 or 'Sheet Name'!A1:B10
+_CROSS_SHEET_RANGE_PATTERN = re.compile(
+    r"^(?:'([^']+)'|([^!]+))!(\$?[A-Z]+\$?\d+:\$?[A-Z]+\$?\d+)$",
+    re.IGNORECASE
+)
 
+# Pattern for sheet.table: Sheet1.Table1 or 'Sheet Name'.Table1
+_SHEET_TABLE_PATTERN = re.compile(r"^(?:'([^']+)'|([^.]+))\.(.+)$")
+
+
+@lru_cache(maxsize=4096)
 def parse_reference(ref: str) -> TableReference:
     """
     Parse a single reference string into a TableReference.
 
+    Results are cached on the raw string, so repeated references share one
+    (frozen) TableReference. See clear_cache().
+
     Args:
         ref: Reference string (e.g., "Sheet1.Table1", "A1:M100")
 
@@ -140,33 +159,23 @@ def parse_reference(ref: str) -> TableReference:
     table_name = None
     range_ref = None
 
-    # Pattern for cell range: A1:M100, $A$1:$M$100, etc.
-    # Excel ranges have letters for columns and numbers for rows
-    range_pattern = r'^(\$?[A-Z]+\$?\d+):(\$?[A-Z]+\$?\d+)$'
-
-    # Pattern for cross-sheet range: Sheet1!A1:B10 or 'Sheet Name'!A1:B10
-    cross_sheet_range_pattern = r"^(?:'([^']+)'|([^!]+))!(\$?[A-Z]+\$?\d+:\$?[A-Z]+\$?\d+)$"
-
-    # Pattern for sheet.table: Sheet1.Table1 or 'Sheet Name'.Table1
-    sheet_table_pattern = r"^(?:'([^']+)'|([^.]+))\.(.+)$"
+    # Try to match simple range first (A1:M100) - the most common form, and
+    # one that can't contain a sheet separator
+    if _RANGE_PATTERN.fullmatch(ref):
+        range_ref = ref.upper()
+        sqlite_name = _generate_sqlite_name(None, None, range_ref)
+        return TableReference(original, None, None, range_ref, sqlite_name)
 
-    # Try to match cross-sheet range first (Sheet!A1:B10)
-    match = re.match(cross_sheet_range_pattern, ref, re.IGNORECASE)
+    # Try to match cross-sheet range (Sheet!A1:B10)
+    match = _CROSS_SHEET_RANGE_PATTERN.match(ref)
     if match:
         sheet_name = match.group(1) or match.group(2)
         range_ref = match.group(3).upper()
         sqlite_name = _generate_sqlite_name(sheet_name, None, range_ref)
         return TableReference(original, sheet_name, None, range_ref, sqlite_name)
 
-    # Try to match simple range (A1:M100)
-    match = re.match(range_pattern, ref, re.IGNORECASE)
-    if match:
-        range_ref = ref.upper()
-        sqlite_name = _generate_sqlite_name(None, None, range_ref)
-        return TableReference(original, None, None, range_ref, sqlite_name)
-
     # Try to match sheet.table format
-    match = re.match(sheet_table_pattern, ref)
+    match = _SHEET_TABLE_PATTERN.match(ref)
     if match:
         sheet_name = match.group(1) or match.group(2)
         table_name = match.group(3)
@@ -185,6 +194,12 @@ def parse_reference(ref: str) -> TableReference:
     return TableReference(original, None, table_name, None, sqlite_name)
 
 
+def clear_cache() -> None:
+    """Discard all cached parse results and substitution patterns."""
+    parse_reference.cache_clear()
+    _substitution_pattern.cache_clear()
+
+
 def validate_query_syntax(query: str) -> None:
     """
     Perform basic SQL syntax validation.
@@ -219,43 +234,33 @@ def is_parameterized_query(query: str) -> bool:
     return count_parameters(query) > 0
 
 
+# A comment, quoted string or identifier, or a ? placeholder
+_PARAMETER_PATTERN = re.compile(rf"{_SKIPPED}|\?")
+
+
 def count_parameters(query: str) -> int:
     """
     Count parameter placeholders in query.
 
+    Placeholders inside comments and quoted strings are not counted.
+
     Args:
         query: SQL query string
 
     Returns:
         Number of ? placeholders
-
-    TODO: Improve to handle quoted strings
     """
-    count = 0
-    in_string = False
-    string_char = None
-    i = 0
+    if '?' not in query:
+        return 0
 
-    while i < len(query):
-        char = query[i]
+    # No comments or quoted text to skip, so every ? is a placeholder
+    if ("'" not in query and '"' not in query
+            and '--' not in query and '/*' not in query):
+        return query.count('?')
 
-        # Handle string literals
-        if char in ("'", '"') and not in_string:
-            in_string = True
-            string_char = char
-        elif char == string_char and in_string:
-            # Check for escaped quote
-            if i + 1 < len(query) and query[i + 1] == string_char:
-                i += 1  # Skip the escaped quote
-            else:
-                in_string = False
-                string_char = None
-        elif char == '?' and not in_string:
-            count += 1
-
-        i += 1
-
-    return count
+    # Comments and quoted text match as a whole, so only bare placeholders
+    # equal '?'
+    return _PARAMETER_PATTERN.findall(query).count('?')
 
 
 def substitute_references(query: str, mapping: dict[str, str]) -> str:
@@ -279,35 +284,58 @@ def substitute_references(query: str, mapping: dict[str, str]) -> str:
     if not mapping:
         return query
 
-    result = query
+    pattern, lookup = _substitution_pattern(frozenset(mapping.items()))
+
+    def replace(match: re.Match) -> str:
+        text = match.group(0)
+        if match.lastgroup != 'ref':
+            # Comment or quoted text - leave it untouched
+            return text
+        return lookup.get(text.lower(), text)
+
+    # Replace every reference in a single pass over the query
+    return pattern.sub(replace, query)
 
-    # Sort mapping by length (longest first) to avoid partial replacements
-    sorted_refs = sorted(mapping.keys(), key=len, reverse=True)
 
-    for original_ref in sorted_refs:
-        sqlite_name = mapping[original_ref]
+@lru_cache(maxsize=256)
+def _substitution_pattern(
+    mapping: frozenset[tuple[str, str]]
+) -> tuple[re.Pattern, dict[str, str]]:
+    """
+    Compile the pattern substitute_references() uses for a mapping.
+
+    Args:
+        mapping: (original_ref, sqlite_table_name) pairs
 
-        # Create a regex pattern that matches the reference as a whole identifier
-        # This handles both quoted and unquoted identifiers
-        # Pattern should match the reference but not as part of a larger word
+    Returns:
+        Pattern matching any reference (group 'ref') or any comment or quoted
+        text, and a lookup of lowercased reference -> SQLite table name
+    """
+    # Sort mapping by length (longest first) so that, at any position, the
+    # alternation prefers Sheet1.Orders over Orders
+    sorted_refs = sorted(mapping, key=lambda item: (-len(item[0]), item[0]))
 
-        # Escape special regex characters in the reference
-        escaped_ref = re.escape(original_ref)
+    alternatives = []
+    lookup = {}
+    for original_ref, sqlite_name in sorted_refs:
+        # Escape special regex characters in the reference, and don't match
+        # it as part of a larger word. Lookarounds rather than \b, so that
+        # references starting or ending with a quote or $ still match.
+        alternatives.append(r'(?<!\w)' + re.escape(original_ref) + r'(?!\w)')
 
-        # Replace the dots with literal dots in the pattern
-        # Handle both quoted ('Sheet Name'.Table) and unquoted (Sheet1.Table) formats
-        pattern = r'\b' + escaped_ref + r'\b'
+        # Matching ignores case, so look replacements up case-insensitively
+        lookup.setdefault(original_ref.lower(), sqlite_name)
 
-        # For references with quotes, we need a different pattern
-        if "'" in original_ref:
-            # Use the escaped pattern as-is for quoted references
-            pattern = escaped_ref
+    # References are tried first so that 'Sheet Name'.Table isn't taken for a
+    # string literal; any other comment or quoted text is skipped whole
+    pattern = re.compile(
+        rf"(?P<ref>{'|'.join(alternatives)})|{_SKIPPED}", re.IGNORECASE
+    )
+    return pattern, lookup
 
-        # Replace all occurrences
-        # Use word boundaries to ensure we don't replace partial matches
-        result = re.sub(pattern, sqlite_name, result, flags=re.IGNORECASE)
 
-    return result
+# Identifier SQLite accepts without quoting
+_PLAIN_IDENTIFIER_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
 
 
 def sanitize_identifier(name: str) -> str:
@@ -321,7 +349,7 @@ def sanitize_identifier(name: str) -> str:
         Valid SQLite identifier (quoted if necessary)
     """
     # Check if quoting is needed
-    if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', name):
+    if _PLAIN_IDENTIFIER_PATTERN.match(name):
         # Valid unquoted identifier
         return name
     else:
@@ -332,234 +360,118 @@ def sanitize_identifier(name: str) -> str:
 
 # Helper functions
 
-def _remove_string_literals(query: str) -> str:
+# A "quoted" or 'quoted' name (quotes are escaped by doubling them) or an
+# unquoted identifier or range such as Orders or $A$1:$M$100
+_DOUBLE_QUOTED = r'"[^"]*(?:""[^"]*)*"'
+_SINGLE_QUOTED = r"'[^']*(?:''[^']*)*'"
+_BARE_NAME = r'[\w$:]+'
+
+# A table reference: 'Sheet Name'.Table, 'Sheet Name'!A1:B10, Sheet1.Table,
+# Sheet2!A1:B50, "Table", Table or A1:M100. Whitespace after the separator
+# is captured separately so it can be dropped from the reference text.
+_REFERENCE = (
+    rf"'[^']*'[.!](?:{_DOUBLE_QUOTED}|{_SINGLE_QUOTED}|{_BARE_NAME})"
+    rf"|(?:{_DOUBLE_QUOTED}|{_BARE_NAME})"
+    rf"(?:[.!](?P<space>\s*)(?:'[^']*'|{_DOUBLE_QUOTED}|{_BARE_NAME}))?"
+)
+
+# Whitespace and comments allowed between a keyword and what follows it
+_GAP = rf"(?:\s|{_COMMENT})+"
+
+# The name, optional column list and "AS (" of a common table expression
+_CTE_DEFINITION = (
+    rf"(?P<cte>\w+|{_DOUBLE_QUOTED})(?:\s|{_COMMENT})*"
+    rf"(?:\([^()]*\)(?:\s|{_COMMENT})*)?AS(?:\s|{_COMMENT})*\("
+)
+
+# Everything extract_table_references() needs from a query. Comments, string
+# literals and quoted identifiers match as a whole so that nothing inside
+# them is mistaken for a keyword; only the named groups produce tokens.
+#
+# The leading lookahead lists the first character of every alternative, so
+# the scan rejects most positions (and keyword-free queries) with a single
+# character test instead of trying each branch. Keep it in sync.
+_SQL_TOKEN_PATTERN = re.compile(
+    r"""(?=[-/'"FJUIW])(?:"""
+    + _SKIPPED
+    + rf"|\b(?:FROM|JOIN){_GAP}(?P<table>{_REFERENCE})?"
+    + rf"|\bUPDATE{_GAP}(?P<update>[^\s,;]+)"
+    + rf"|\bINSERT{_GAP}INTO{_GAP}(?P<insert>[^\s,;(]+)"
+    + rf"|\bWITH(?:{_GAP}RECURSIVE)?{_GAP}{_CTE_DEFINITION})",
+    re.IGNORECASE
+)
+
+# A further ", name AS (" right after the body of the previous CTE
+_NEXT_CTE_PATTERN = re.compile(
+    rf"(?:\s|{_COMMENT})*,(?:\s|{_COMMENT})*{_CTE_DEFINITION}",
+    re.IGNORECASE
+)
+
+# Parentheses outside comments, string literals and quoted identifiers
+_PARENTHESIS_PATTERN = re.compile(rf"{_SKIPPED}|(?P<paren>[()])")
+
+
+def _tokenize_sql(query: str) -> Iterator[tuple[str, str]]:
     """
-    Replace string literals with placeholders to avoid false matches.
-
-    Preserves single-quoted strings that are followed by . or ! as they
-    are likely sheet references, not string literals.
+    Scan a query once, yielding the tokens that name tables.
 
     Args:
         query: SQL query string
 
-    Returns:
-        Query with string literals replaced by spaces (but sheet refs preserved)
+    Yields:
+        ('table', reference text) for each reference after FROM, JOIN,
+        UPDATE or INSERT INTO, and ('cte', name) for each WITH clause name
     """
-    result = []
-    in_string = False
-    string_char = None
-    i = 0
-
-    while i < len(query):
-        char = query[i]
-
-        if char in ("'", '"') and not in_string:
-            # Check if this single quote is a sheet reference (followed by . or !)
-            if char == "'":
-                # Find the closing quote
-                j = i + 1
-                while j < len(query):
-                    if query[j] == "'" and (j + 1 >= len(query) or query[j + 1] != "'"):
-                        # Found closing quote
-                        # Check what follows
-                        if j + 1 < len(query) and query[j + 1] in ('.', '!'):
-                            # This is a sheet reference, preserve it
-                            while i <= j + 1:
-                                result.append(query[i])
-                                i += 1
-                            i -= 1  # Back up one because loop will increment
-                            break
-                        else:
-                            # Regular string literal, replace it
-                            in_string = True
-                            string_char = char
-                            result.append(' ')
-                            break
-                    j += 1
-                else:
-                    # No closing quote found, treat as string
-                    in_string = True
-                    string_char = char
-                    result.append(' ')
-            else:
-                # Double quote - always an identifier, keep it
-                in_string = True
-                string_char = char
-                result.append(char)
-        elif char == string_char and in_string:
-            # Check for escaped quote
-            if i + 1 < len(query) and query[i + 1] == string_char:
-                i += 1  # Skip the escaped quote
-                if string_char == '"':
-                    result.append(char)
-                    result.append(char)
-                else:
-                    result.append(' ')
-                    result.append(' ')
-            else:
-                # Closing quote
-                is_double_quote = (string_char == '"')
-                in_string = False
-                string_char = None
-                if is_double_quote:
-                    result.append(char)
-                else:
-                    result.append(' ')
-        elif in_string:
-            if string_char == '"':
-                result.append(char)  # Preserve double-quoted content
-            else:
-                result.append(' ')  # Replace single-quoted content with space
-        else:
-            result.append(char)
-
-        i += 1
-
-    return ''.join(result)
-
-
-def _remove_comments(query: str) -> str:
+    for match in _SQL_TOKEN_PATTERN.finditer(query):
+        kind = match.lastgroup
+        if kind == 'cte':
+            yield from _iter_cte_names(query, match)
+        elif kind == 'table' and match.group('space'):
+            # Whitespace after the separator isn't part of the reference
+            yield 'table', (
+                query[match.start(kind):match.start('space')]
+                + query[match.end('space'):match.end(kind)]
+            )
+        elif kind is not None:
+            yield 'table', match.group(kind)
+
+
+def _iter_cte_names(query: str, match: re.Match) -> Iterator[tuple[str, str]]:
     """
-    Remove SQL comments from query.
+    Yield the names defined by a WITH clause.
+
+    Only a comma directly after a CTE body starts another CTE, so lookalikes
+    such as "WINDOW w AS (...), w2 AS (...)" are not mistaken for one.
 
     Args:
         query: SQL query string
+        match: Match of the WITH keyword and the first CTE definition
 
-    Returns:
-        Query with comments removed
+    Yields:
+        ('cte', name) for each CTE in the clause
     """
-    # Remove single-line comments (-- comment)
-    query = re.sub(r'--[^\n]*', ' ', query)
-
-    # Remove multi-line comments (/* comment */)
-    query = re.sub(r'/\*.*?\*/', ' ', query, flags=re.DOTALL)
+    while match is not None:
+        yield 'cte', match.group('cte')
+        end = _skip_parentheses(query, match.end())
+        match = _NEXT_CTE_PATTERN.match(query, end)
 
-    return query
 
+def _skip_parentheses(query: str, pos: int) -> int:
+    """Return the position just past the ")" closing the group open at pos."""
+    depth = 1
+    for match in _PARENTHESIS_PATTERN.finditer(query, pos):
+        paren = match.group('paren')
+        if paren is None:
+            continue
+        depth += 1 if paren == '(' else -1
+        if depth == 0:
+            return match.end()
+    return len(query)
 
-def _extract_reference_at_position(query: str, start_pos: int) -> Optional[str]:
-    """
-    Extract a table reference starting at the given position.
-
-    Args:
-        query: SQL query string
-        start_pos: Position to start extracting from
 
-    Returns:
-        The extracted reference string, or None if not found
-    """
-    # Skip whitespace
-    while start_pos < len(query) and query[start_pos].isspace():
-        start_pos += 1
-
-    if start_pos >= len(query):
-        return None
-
-    # Check if it starts with a quote (for sheet names with spaces)
-    if query[start_pos] == "'":
-        # Extract quoted sheet name
-        end_quote = query.find("'", start_pos + 1)
-        if end_quote == -1:
-            return None
-
-        # Check if there's a dot or exclamation mark after the quote
-        next_pos = end_quote + 1
-        if next_pos < len(query) and query[next_pos] in ('.', '!'):
-            # Continue extracting the rest (table name or range)
-            rest_start = next_pos + 1
-            rest = _extract_identifier(query, rest_start)
-            if rest:
-                return query[start_pos:end_quote + 1] + query[next_pos] + rest
-        return None
-
-    # Extract identifier (could be sheet name, table name, or range)
-    identifier = _extract_identifier(query, start_pos)
-
-    if not identifier:
-        return None
-
-    # Check if there's a dot or exclamation mark after the identifier
-    next_pos = start_pos + len(identifier)
-    if next_pos < len(query) and query[next_pos] in ('.', '!'):
-        # There's more - extract the rest
-        rest_start = next_pos + 1
-        # Skip whitespace after the separator
-        while rest_start < len(query) and query[rest_start].isspace():
-            rest_start += 1
-
-        # Check for quoted identifier
-        if rest_start < len(query) and query[rest_start] == "'":
-            end_quote = query.find("'", rest_start + 1)
-            if end_quote != -1:
-                rest = query[rest_start:end_quote + 1]
-            else:
-                rest = _extract_identifier(query, rest_start)
-        else:
-            rest = _extract_identifier(query, rest_start)
-
-        if rest:
-            return identifier + query[next_pos] + rest
-
-    return identifier
-
-
-def _extract_identifier(query: str, start_pos: int) -> Optional[str]:
-    """
-    Extract a SQL identifier or Excel range starting at the given position.
-
-    Args:
-        query: SQL query string
-        start_pos: Position to start extracting from
-
-    Returns:
-        The extracted identifier, or None if not found
-    """
-    if start_pos >= len(query):
-        return None
-
-    # Check for quoted identifier
-    if query[start_pos] == '"':
-        # Extract until closing quote
-        end_pos = start_pos + 1
-        while end_pos < len(query):
-            if query[end_pos] == '"':
-                # Check for escaped quote
-                if end_pos + 1 < len(query) and query[end_pos + 1] == '"':
-                    end_pos += 2
-                else:
-                    return query[start_pos:end_pos + 1]
-            else:
-                end_pos += 1
-        return None
-
-    # Check for single-quoted identifier (sheet names)
-    if query[start_pos] == "'":
-        end_pos = start_pos + 1
-        while end_pos < len(query):
-            if query[end_pos] == "'":
-                # Check for escaped quote
-                if end_pos + 1 < len(query) and query[end_pos + 1] == "'":
-                    end_pos += 2
-                else:
-                    return query[start_pos:end_pos + 1]
-            else:
-                end_pos += 1
-        return None
-
-    # Extract unquoted identifier or range
-    # Valid characters: letters, numbers, underscore, $, colon (for ranges)
-    end_pos = start_pos
-    while end_pos < len(query):
-        char = query[end_pos]
-        if char.isalnum() or char in ('_', '$', ':'):
-            end_pos += 1
-        else:
-            break
-
-    if end_pos > start_pos:
-        return query[start_pos:end_pos]
-
-    return None
+# Runs of characters replaced by a single underscore in generated names
+_NAME_SEPARATOR_PATTERN = re.compile(r'[^a-zA-Z0-9_]+')
+_RANGE_SEPARATOR_PATTERN = re.compile(r'[^a-zA-Z0-9]+')
 
 
 def _generate_sqlite_name(
@@ -582,17 +494,17 @@ def _generate_sqlite_name(
 
     if sheet_name:
         # Sanitize sheet name
-        sanitized = re.sub(r'[^a-zA-Z0-9_]+', '_', sheet_name.lower())
+        sanitized = _NAME_SEPARATOR_PATTERN.sub('_', sheet_name.lower())
         parts.append(sanitized.strip('_'))
 
     if table_name:
         # Sanitize table name
-        sanitized = re.sub(r'[^a-zA-Z0-9_]+', '_', table_name.lower())
+        sanitized = _NAME_SEPARATOR_PATTERN.sub('_', table_name.lower())
         parts.append(sanitized.strip('_'))
 
     if range_ref:
         # Sanitize range (e.g., A1:M100 -> a1_m100)
-        sanitized = re.sub(r'[^a-zA-Z0-9]+', '_', range_ref.lower())
+        sanitized = _RANGE_SEPARATOR_PATTERN.sub('_', range_ref.lower())
         parts.append(sanitized.strip('_'))
 
     # Join parts with underscore
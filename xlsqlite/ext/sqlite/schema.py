@@ -13,6 +13,7 @@ from typing import Optional, Any
 import sqlite3
 
 # Note: In Python in Excel, pandas is available
+import numpy as np
 import pandas as pd
 
 from parser import TableReference
@@ -136,6 +137,25 @@ def resolve_reference(ref: TableReference) -> pd.DataFrame:
     return df
 
 
+# Whole numbers at or beyond this magnitude don't fit in a 64-bit integer
+INT64_LIMIT = 2.0 ** 63
+
+
+def is_integral(values: np.ndarray) -> bool:
+    """
+    Check whether every float in an array is a whole number that fits in int64.
+
+    Args:
+        values: float64 array without NaN
+
+    Returns:
+        True if each value has no fractional part and |value| < 2**63
+        (which also rules out infinity)
+    """
+    fractional, _ = np.modf(values)
+    return bool((np.abs(values) < INT64_LIMIT).all() and not fractional.any())
+
+
 def infer_column_type(series: pd.Series) -> str:
     """
     Infer SQLite type for a pandas Series.
@@ -171,7 +191,14 @@ def infer_column_type(series: pd.Series) -> str:
     # Check if numeric (integers or floats)
     try:
         if pd.api.types.is_numeric_dtype(non_null):
+            # Integer dtypes need no per-value check
+            if pd.api.types.is_integer_dtype(non_null):
+                return SQLITE_INTEGER
             # Check if all non-null values are whole numbers
+            if pd.api.types.is_float_dtype(non_null):
+                if is_integral(non_null.to_numpy(dtype=float)):
+                    return SQLITE_INTEGER
+                return SQLITE_REAL
             if all(float(x).is_integer() for x in non_null if pd.notna(x)):
                 return SQLITE_INTEGER
             return SQLITE_REAL
@@ -356,9 +383,11 @@ def load_data_to_sqlite(
         col_names = ", ".join([c.sqlite_name for c in schema.columns])
         insert_sql = f"INSERT INTO {schema.sqlite_name} ({col_names}) VALUES ({placeholders})"
         
-        # Convert DataFrame to list of tuples
-        rows = [tuple(row) for row in prepared_df.values]
-        conn.executemany(insert_sql, rows)
+        # Convert each column to native Python values in one vectorized pass
+        # (numpy integers would otherwise be bound as BLOBs) and let
+        # executemany() pull the rows from a lazy zip in its C loop
+        columns = [series.to_numpy(dtype=object) for _, series in prepared_df.items()]
+        conn.executemany(insert_sql, zip(*columns))
     
     conn.commit()
 